@@ -0,0 +1,54 @@
+"""
+Compare one CLI process per schema with a single --batch process over the same schemas.
+
+python benchmarks/bench_batch.py [-n NUMBER] [-j JOBS]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import make_schema
+
+SCRIPT = str(Path(__file__).parent.parent / 'json_schema_to_class.py')
+
+
+def timed(commands: list, cwd: Path) -> float:
+    start = time.perf_counter()
+    for command in commands:
+        subprocess.run(command, cwd=str(cwd), check=False, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--number', type=int, default=200)
+    arg_parser.add_argument('-j', '--jobs', type=int, default=4)
+    arguments = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        names = []
+        for index in range(arguments.number):
+            schema = make_schema(depth=3, width=8, definitions=2)
+            schema['title'] = f'schema_{index}'
+            (temp_dir / f'schema_{index}.json').write_text(json.dumps(schema))
+            names.append(f'schema_{index}.json')
+        (temp_dir / 'listing.txt').write_text('\n'.join(names) + '\n')
+
+        results = {
+            'per_file_s': timed([[sys.executable, SCRIPT, name, '-o', f'a_{name}.py'] for name in names], temp_dir),
+            'batch_s': timed([[sys.executable, SCRIPT, '--batch', 'listing.txt', '-o', 'b']], temp_dir),
+            'batch_jobs_s': timed(
+                [[sys.executable, SCRIPT, '--batch', 'listing.txt', '-o', 'c', '-j', str(arguments.jobs)]], temp_dir
+            ),
+        }
+
+    print(json.dumps({name: round(value, 3) for name, value in results.items()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compare memory, construction time and whole-field access of array classes with and without --columnar.
+
+python benchmarks/bench_columnar.py [-n NUMBER] [--width WIDTH]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import json_schema_to_class
+from synthetic import make_values, object_schema
+
+
+def measure(cls: type, values: list) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    instances = cls(values)
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    if hasattr(instances, 'field_0'):
+        total = sum(instances.field_0)
+    else:
+        total = sum(item.field_0 for item in instances)
+    field_seconds = time.perf_counter() - start
+    assert total == 0
+    return {
+        'bytes_per_item': round(size / len(values), 1),
+        'construct_ms': round(seconds * 1000, 2),
+        'sum_field_ms': round(field_seconds * 1000, 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--number', type=int, default=200000)
+    arg_parser.add_argument('--width', type=int, default=8)
+    arguments = arg_parser.parse_args()
+
+    schema = {'title': 'records', 'type': 'array', 'items': object_schema(0, arguments.width, 0)}
+    values = [make_values(schema['items']) for _ in range(arguments.number)]
+    results = {}
+    for name, columnar in (('list', False), ('columnar', True)):
+        options = json_schema_to_class.Options(generate_columnar_arrays=columnar)
+        results[name] = measure(json_schema_to_class.compile_class(schema, options=options), values)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
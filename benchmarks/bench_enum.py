@@ -0,0 +1,74 @@
+"""
+Compare memory and construction time of records with enum fields with and without --enum.
+
+python benchmarks/bench_enum.py [-n NUMBER]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import json_schema_to_class
+
+SCHEMA = {
+    'title': 'event',
+    'type': 'object',
+    'properties': {
+        'level': {'enum': ['debug', 'info', 'warning', 'error'], 'default': 'info'},
+        'source': {'type': 'string', 'enum': ['web', 'worker', 'cron']},
+        'priority': {'type': 'integer', 'enum': [1, 2, 3]},
+        'count': {'type': 'integer', 'default': 0},
+    }
+}
+
+
+def make_lines(number: int) -> list:
+    levels, sources = ['debug', 'info', 'warning', 'error'], ['web', 'worker', 'cron']
+    return [
+        json.dumps({
+            'level': levels[index % 4], 'source': sources[index % 3], 'priority': index % 3 + 1, 'count': index
+        })
+        for index in range(number)
+    ]
+
+
+def measure(cls: type, lines: list) -> dict:
+    records = [json.loads(line) for line in lines]
+    start = time.perf_counter()
+    instances = [cls(record) for record in records]
+    seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    errors = sum(1 for instance in instances if instance.level == 'error')
+    compare_seconds = time.perf_counter() - start
+    assert errors == len(lines) // 4
+    del records, instances
+
+    tracemalloc.start()
+    instances = [cls(json.loads(line)) for line in lines]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return {
+        'bytes_per_item': round(size / len(lines), 1),
+        'construct_ms': round(seconds * 1000, 2),
+        'compare_ms': round(compare_seconds * 1000, 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--number', type=int, default=200000)
+    arguments = arg_parser.parse_args()
+
+    lines = make_lines(arguments.number)
+    results = {}
+    for name, enum in (('plain', False), ('enum', True)):
+        options = json_schema_to_class.Options(generate_enum_classes=enum, generate_slots=True)
+        results[name] = measure(json_schema_to_class.compile_class(SCHEMA, options=options), lines)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
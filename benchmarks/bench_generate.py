@@ -0,0 +1,44 @@
+"""
+Time Parser.generate on synthetic schemas of growing depth and width.
+
+python benchmarks/bench_generate.py [--depths 5 10 20] [--widths 200 1000]
+"""
+import argparse
+import json
+import time
+
+import json_schema_to_class
+from synthetic import make_schema
+
+
+def measure(depth: int, width: int, repeat: int = 3) -> dict:
+    schema = make_schema(depth=depth, width=width, array_every=0)
+    parser = json_schema_to_class.Parser()
+    parser.parse(schema)
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        code = parser.generate(schema)
+        seconds.append(time.perf_counter() - start)
+    return {
+        'depth': depth,
+        'width': width,
+        'output_bytes': len(code),
+        'ms': round(min(seconds) * 1000, 2),
+        'ns_per_byte': round(min(seconds) * 1e9 / len(code), 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--depths', type=int, nargs='+', default=[5, 10, 15, 20])
+    arg_parser.add_argument('--widths', type=int, nargs='+', default=[200, 1000])
+    arguments = arg_parser.parse_args()
+
+    for width in arguments.widths:
+        for depth in arguments.depths:
+            print(json.dumps(measure(depth, width)))
+
+
+if __name__ == '__main__':
+    main()
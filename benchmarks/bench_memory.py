@@ -0,0 +1,56 @@
+"""
+Compare per-instance memory of generated classes with and without --slots.
+
+python benchmarks/bench_memory.py [-n NUMBER]
+"""
+import argparse
+import json
+import tracemalloc
+import types
+from pathlib import Path
+
+import json_schema_to_class
+
+SCHEMA_PATH = Path(__file__).parent.parent / 'tests' / 'test_schema.json'
+VALUES = {
+    "base_lr": 0.1,
+    "milestones": [0.4, 0.7, 0.9],
+    "warm_up": {
+        "start": 0.2,
+        "steps": 1024
+    }
+}
+
+
+def load_module(name: str, **options) -> types.ModuleType:
+    code = json_schema_to_class.generate_code(SCHEMA_PATH, options=json_schema_to_class.Options(**options))
+    module = types.ModuleType(name)
+    exec(compile(code, name, 'exec'), module.__dict__)
+    return module
+
+
+def measure(cls: type, number: int) -> float:
+    values = [VALUES] * number
+    tracemalloc.start()
+    instances = cls(values)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size / number
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--number', type=int, default=100000)
+    arguments = arg_parser.parse_args()
+
+    results = {}
+    for name, options in {'dict': {}, 'slots': {'generate_slots': True}}.items():
+        cls = load_module(name, **options).LrSchedulerConfigs
+        results[name] = measure(cls, arguments.number)
+
+    print(json.dumps({name: f'{size:.1f} bytes' for name, size in results.items()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
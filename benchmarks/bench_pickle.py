@@ -0,0 +1,69 @@
+"""
+Compare pickle size and round-trip time of a large array payload with and without --pickle.
+
+python benchmarks/bench_pickle.py [-n NUMBER]
+"""
+import argparse
+import json
+import pickle
+import sys
+import time
+import types
+from pathlib import Path
+
+import json_schema_to_class
+
+SCHEMA_PATH = Path(__file__).parent.parent / 'tests' / 'test_schema.json'
+VALUES = {
+    "base_lr": 0.1,
+    "milestones": [0.4, 0.7, 0.9],
+    "warm_up": {
+        "start": 0.2,
+        "steps": 1024
+    }
+}
+
+
+def load_module(name: str, **options) -> types.ModuleType:
+    code = json_schema_to_class.generate_code(SCHEMA_PATH, options=json_schema_to_class.Options(**options))
+    module = types.ModuleType(name)
+    exec(compile(code, name, 'exec'), module.__dict__)
+    sys.modules[name] = module
+    return module
+
+
+def measure(cls: type, number: int, repeat: int = 3) -> dict:
+    instances = cls([VALUES] * number)
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = pickle.dumps(instances, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(data)
+        seconds.append(time.perf_counter() - start)
+    return {
+        'bytes_per_item': round(len(data) / number, 1),
+        'round_trip_ms': round(min(seconds) * 1000, 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--number', type=int, default=100000)
+    arguments = arg_parser.parse_args()
+
+    variants = {
+        'dict': {},
+        'pickle': {'generate_pickle_methods': True},
+        'slots': {'generate_slots': True},
+        'slots_pickle': {'generate_slots': True, 'generate_pickle_methods': True},
+    }
+    results = {}
+    for name, options in variants.items():
+        cls = load_module(f'bench_pickle_{name}', **options).LrSchedulerConfigs
+        results[name] = measure(cls, arguments.number)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
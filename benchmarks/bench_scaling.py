@@ -0,0 +1,54 @@
+"""
+Time parsing and generation on synthetic schemas scaled in depth and in width.
+
+Parsing is reported per schema property and generation per output byte, since
+indentation makes the generated code grow quadratically with depth.
+
+python benchmarks/bench_scaling.py [--depths 250 500 1000 2000] [--widths 1000 4000 16000]
+"""
+import argparse
+import json
+import time
+
+import json_schema_to_class
+from synthetic import make_schema
+
+
+def measure(depth: int, width: int, repeat: int = 3) -> dict:
+    schema = make_schema(depth=depth, width=width, array_every=3)
+    parse_seconds, generate_seconds = [], []
+    for _ in range(repeat):
+        parser = json_schema_to_class.Parser()
+        start = time.perf_counter()
+        parser.parse(schema)
+        parse_seconds.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        code = parser.generate(schema)
+        generate_seconds.append(time.perf_counter() - start)
+    properties = (depth + 1) * (width + 1)
+    return {
+        'depth': depth,
+        'width': width,
+        'properties': properties,
+        'parse_ms': round(min(parse_seconds) * 1000, 2),
+        'generate_ms': round(min(generate_seconds) * 1000, 2),
+        'output_bytes': len(code),
+        'parse_us_per_property': round(min(parse_seconds) * 1e6 / properties, 2),
+        'generate_ns_per_byte': round(min(generate_seconds) * 1e9 / len(code), 2),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--depths', type=int, nargs='+', default=[250, 500, 1000, 2000])
+    arg_parser.add_argument('--widths', type=int, nargs='+', default=[1000, 4000, 16000])
+    arguments = arg_parser.parse_args()
+
+    for depth in arguments.depths:
+        print(json.dumps(measure(depth, 4)))
+    for width in arguments.widths:
+        print(json.dumps(measure(2, width)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare construction and module load time of --validate (jsonschema) and --inline-validate output.
+
+The per_call mode re-validates with jsonschema.validate() on every construction, which rebuilds the
+validator and re-checks the schema each time; --validate builds the validator and checks the schema once.
+
+python benchmarks/bench_validate.py [-n NUMBER]
+"""
+import argparse
+import json
+import timeit
+import types
+from pathlib import Path
+
+import jsonschema
+
+import json_schema_to_class
+
+SCHEMA_PATH = Path(__file__).parent.parent / 'tests' / 'test_schema.json'
+VALUES = [
+    {
+        "base_lr": 0.1,
+        "decay_factor": 0.99,
+        "lr_decay": 0.1,
+        "lr_mode": "cos",
+        "target_lr": 0.0002,
+        "milestones": [0.4, 0.7, 0.9],
+        "warm_up": {
+            "start": 0.2,
+            "steps": 1024
+        }
+    }
+] * 8
+
+
+def load_module(name: str, **options) -> types.ModuleType:
+    code = json_schema_to_class.generate_code(SCHEMA_PATH, options=json_schema_to_class.Options(**options))
+    module = types.ModuleType(name)
+    exec(compile(code, name, 'exec'), module.__dict__)
+    return module
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('-n', '--number', type=int, default=2000)
+    arguments = arg_parser.parse_args()
+
+    schema = json.loads(SCHEMA_PATH.read_text())
+    plain = load_module('per_call').LrSchedulerConfigs
+
+    def per_call(values):
+        jsonschema.validate(values, schema)
+        return plain(values)
+
+    modes = {
+        'plain': {},
+        'validate': {'generate_validate_code': True},
+        'inline_validate': {'generate_inline_validate_code': True},
+    }
+    results = {'per_call': {'construct_us': min(timeit.repeat(
+        lambda: per_call(VALUES), number=arguments.number, repeat=5
+    )) / arguments.number * 1e6}}
+    for name, options in modes.items():
+        load_s = min(timeit.repeat(lambda: load_module(name, **options), number=10, repeat=3)) / 10
+        cls = load_module(name, **options).LrSchedulerConfigs
+        seconds = min(timeit.repeat(lambda: cls(VALUES), number=arguments.number, repeat=5))
+        results[name] = {'construct_us': seconds / arguments.number * 1e6, 'load_ms': load_s * 1000}
+
+    print(json.dumps({
+        name: {key: round(value, 2) for key, value in result.items()} for name, result in results.items()
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
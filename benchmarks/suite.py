@@ -0,0 +1,177 @@
+"""
+Benchmark schema parsing, code generation, directory builds and the generated classes.
+
+python benchmarks/suite.py [--quick] [-o results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import json_schema_to_class
+from synthetic import make_schema, make_values
+
+CASES = (
+    {'name': 'flat', 'depth': 0, 'width': 32},
+    {'name': 'deep', 'depth': 12, 'width': 4, 'array_every': 0},
+    {'name': 'arrays', 'depth': 6, 'width': 8, 'array_every': 2},
+    {'name': 'refs', 'depth': 2, 'width': 8, 'definitions': 16},
+    {'name': 'repr', 'depth': 3, 'width': 8, 'options': {'generate_repr_method': True}},
+    {'name': 'instrumented', 'depth': 3, 'width': 8, 'options': {'generate_instrumentation': True}},
+    {'name': 'inline_validate', 'depth': 3, 'width': 8, 'options': {'generate_inline_validate_code': True}},
+    {'name': 'validate', 'depth': 3, 'width': 8, 'options': {'generate_validate_code': True}, 'requires': 'jsonschema'},
+)
+
+HIGHER_IS_WORSE = ('_ms', '_us', '_bytes')
+
+
+def best_of(function: Callable[[], Any], repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def load_module(name: str, code: str) -> types.ModuleType:
+    module = types.ModuleType(name)
+    exec(compile(code, name, 'exec'), module.__dict__)
+    return module
+
+
+def bench_case(case: dict, repeat: int, instances: int) -> Dict[str, Any]:
+    schema = make_schema(
+        depth=case['depth'], width=case['width'], definitions=case.get('definitions', 0),
+        array_every=case.get('array_every', 3)
+    )
+    options = json_schema_to_class.Options(**case.get('options', {}))
+
+    parser = json_schema_to_class.Parser(options=options)
+    parse_seconds = best_of(lambda: json_schema_to_class.Parser(options=options).parse(schema), repeat)
+    parser.parse(schema)
+    code = parser.generate(schema)
+    generate_seconds = best_of(lambda: parser.generate(schema), repeat)
+
+    cls = getattr(load_module(case['name'], code), json_schema_to_class.Item(name=schema['title']).class_name())
+    values = make_values(schema)
+    construct_seconds = best_of(lambda: [cls(values) for _ in range(instances)], repeat)
+
+    tracemalloc.start()
+    objects = [cls(values) for _ in range(instances)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return {
+        'parse_ms': round(parse_seconds * 1000, 3),
+        'generate_ms': round(generate_seconds * 1000, 3),
+        'output_bytes': len(code),
+        'construct_us': round(construct_seconds * 1e6 / instances, 3),
+        'instance_bytes': round(size / instances, 1),
+    }
+
+
+def bench_dir(files: int, repeat: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        schema_dir = Path(temp_dir) / 'schema'
+        output_dir = Path(temp_dir) / 'bench_build'
+        schema_dir.mkdir()
+        for index in range(files):
+            schema = make_schema(depth=3, width=8, definitions=2)
+            schema['title'] = f'schema_{index}'
+            (schema_dir / f'schema_{index}.json').write_text(json.dumps(schema))
+
+        def full_build():
+            shutil.rmtree(str(output_dir), ignore_errors=True)
+            json_schema_to_class.generate_dir(schema_dir, output_dir)
+
+        full_seconds = best_of(full_build, repeat)
+        incremental_seconds = best_of(
+            lambda: json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True), repeat
+        )
+        import_seconds = json_schema_to_class.measure_import('bench_build', repeat=repeat, cwd=Path(temp_dir))
+
+    return {
+        'files': files,
+        'generate_dir_ms': round(full_seconds * 1000, 3),
+        'incremental_noop_ms': round(incremental_seconds * 1000, 3),
+        'import_ms': round(import_seconds * 1000, 3),
+    }
+
+
+def available(module: Optional[str]) -> bool:
+    if module is None:
+        return True
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    repeat, instances, files = (2, 200, 8) if quick else (5, 2000, 32)
+    results: Dict[str, Any] = {}
+    for case in CASES:
+        if available(case.get('requires')):
+            results[case['name']] = bench_case(case, repeat, instances)
+        else:
+            print(f'skip {case["name"]}: requires {case["requires"]}', file=sys.stderr)
+    results['generate_dir'] = bench_dir(files, repeat)
+    return {
+        'python': platform.python_version(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    regressions = []
+    for name, metrics in current['results'].items():
+        for metric, value in metrics.items():
+            base = baseline['results'].get(name, {}).get(metric)
+            if not metric.endswith(HIGHER_IS_WORSE) or not base:
+                continue
+            ratio = value / base
+            line = f'{name}.{metric}: {base} -> {value} ({ratio - 1:+.1%})'
+            print(line)
+            if ratio > 1 + threshold:
+                regressions.append(line)
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--quick', action='store_true', help='fewer repeats and instances', default=False)
+    arg_parser.add_argument('-o', '--output', type=str, help='write results as JSON', default=None)
+    arg_parser.add_argument('--compare', type=str, help='baseline JSON to compare against', default=None)
+    arg_parser.add_argument('--threshold', type=float, help='allowed slowdown ratio', default=0.2)
+    arguments = arg_parser.parse_args()
+
+    report = run(quick=arguments.quick)
+    content = json.dumps(report, indent=2, sort_keys=True)
+    if arguments.output is None:
+        print(content)
+    else:
+        Path(arguments.output).write_text(content + '\n')
+
+    if arguments.compare is not None:
+        baseline = json.loads(Path(arguments.compare).read_text())
+        regressions = compare(report, baseline, arguments.threshold)
+        if regressions:
+            print(f'{len(regressions)} regressions over {arguments.threshold:.0%}:', file=sys.stderr)
+            for line in regressions:
+                print(f'  {line}', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Synthetic JSON schemas for benchmarks.
+"""
+from typing import Any, Dict
+
+SCALAR_SCHEMAS = (
+    {'type': 'integer', 'default': 0, 'minimum': 0},
+    {'type': 'number', 'default': 0.5},
+    {'type': 'string', 'default': 'value', 'maxLength': 64},
+    {'type': 'boolean', 'default': False},
+    {'enum': ['alpha', 'beta', 'gamma'], 'default': 'alpha'},
+)
+
+
+def object_schema(depth: int, width: int, array_every: int = 3) -> Dict[str, Any]:
+    schema: Dict[str, Any] = {}
+    for level in range(depth + 1):
+        properties = {}
+        for index in range(width):
+            properties[f'field_{index}'] = dict(SCALAR_SCHEMAS[index % len(SCALAR_SCHEMAS)])
+        if level > 0:
+            if array_every and level % array_every == 0:
+                properties[f'children_{level}'] = {'type': 'array', 'items': schema}
+            else:
+                properties[f'child_{level}'] = schema
+        schema = {'type': 'object', 'properties': properties}
+    return schema
+
+
+def make_schema(depth: int = 3, width: int = 8, definitions: int = 0, array_every: int = 3) -> Dict[str, Any]:
+    schema = dict(object_schema(depth, width, array_every), title=f'synthetic_{depth}_{width}')
+    if definitions:
+        schema['definitions'] = {
+            f'shared_{index}': object_schema(1, width, 0) for index in range(definitions)
+        }
+        for index in range(definitions):
+            schema['properties'][f'ref_{index}'] = {'$ref': f'#/definitions/shared_{index}'}
+    return schema
+
+
+def make_values(schema: Dict[str, Any]) -> Any:
+    if '$ref' in schema:
+        return {}
+    if schema.get('type') == 'object':
+        return {name: make_values(child) for name, child in schema.get('properties', {}).items()}
+    if schema.get('type') == 'array':
+        return [make_values(schema['items']) for _ in range(2)]
+    return schema.get('default')
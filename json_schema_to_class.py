@@ -1,7 +1,26 @@
 import argparse
+import hashlib
+import importlib.abc
+import importlib.util
+import itertools
 import json
+import linecache
+import marshal
+import os
+import random
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import types
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import lazy_write
 
@@ -10,25 +29,209 @@ class Config:
     indent: int = 4
     line_break: str = '\n'
     generate_repr_method: bool = False
+    generate_slots: bool = False
+    generate_to_dict_method: bool = False
+    generate_stream_methods: bool = False
+    generate_columnar_arrays: bool = False
+    generate_frozen_classes: bool = False
+    generate_pickle_methods: bool = False
+    generate_instrumentation: bool = False
+    generate_enum_classes: bool = False
+    generate_lazy_properties: bool = False
     generate_validate_code: bool = False
+    generate_inline_validate_code: bool = False
     generated_warning: bool = True
-
-
-def spaces(level: int):
-    return ' ' * Config.indent * level
-
-
-def indent_line(line: str, level: int):
-    return spaces(level=level) + line if line else ''
-
-
-def indent_class(code: str, level: int):
-    return Config.line_break.join(indent_line(line, level) for line in code.splitlines())
+    deduplicate_models: bool = False
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        return {key: getattr(cls, key) for key in cls.__annotations__}
+
+    @classmethod
+    def restore(cls, options: Dict[str, Any]) -> None:
+        for key, value in options.items():
+            setattr(cls, key, value)
+
+
+class Options:
+    __slots__ = tuple(Config.__annotations__)
+
+    def __init__(self, **kwargs):
+        unknown = set(kwargs) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f'Unknown options {sorted(unknown)}')
+        for key in self.__slots__:
+            setattr(self, key, kwargs.get(key, getattr(Config, key)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()
+
+    def __eq__(self, other):
+        return isinstance(other, Options) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f'Options({", ".join(f"{key}={repr(value)}" for key, value in self.to_dict().items())})'
+
+    def spaces(self, level: int):
+        return ' ' * self.indent * level
+
+
+class CodeWriter:
+    def __init__(self, options: Options, level: int = 0):
+        self.options = options
+        self.level = level
+        self.lines: List[str] = []
+        self.prefixes: List[str] = []
+
+    def prefix(self, level: int) -> str:
+        while len(self.prefixes) <= level:
+            self.prefixes.append(self.options.spaces(len(self.prefixes)))
+        return self.prefixes[level]
+
+    def line(self, line: str = '', level: int = 0) -> None:
+        self.lines.append(self.prefix(self.level + level) + line if line else '')
+
+    def extend(self, lines: List[str]) -> None:
+        prefix = self.prefix(self.level)
+        self.lines.extend(prefix + line if line else '' for line in lines)
+
+    @contextmanager
+    def indent(self, level: int = 1):
+        self.level += level
+        try:
+            yield self
+        finally:
+            self.level -= level
+
+    def getvalue(self) -> str:
+        return self.options.line_break.join(self.lines)
+
+
+GENERATED_WARNING = '"""This file is generated. DO NOT EDIT IT MANUALLY!"""'
+VALIDATION_MODULE = '_validation'
+
+VALIDATION_ERROR_CODE = (
+    (0, 'class ValidationError(ValueError):'),
+    (1, 'def __init__(self, path: str, message: str):'),
+    (2, 'super().__init__(f"{path}: {message}")'),
+    (2, 'self.path = path'),
+    (2, 'self.message = message'),
+)
+
+ENUM_LOOKUP_CODE = (
+    (0, 'class EnumLookup(dict):'),
+    (1, 'def __init__(self, enum_class):'),
+    (2, 'super().__init__({member.value: member for member in enum_class})'),
+    (2, 'self[None] = None'),
+    (2, 'self.enum_class = enum_class'),
+    (0, ''),
+    (1, 'def __missing__(self, value):'),
+    (2, 'raise ValueError(f"{value!r} is not a valid {self.enum_class.__name__}")'),
+)
+
+FROZEN_VALUE_CODE = (
+    (0, 'class _FrozenDict(dict):'),
+    (1, '__slots__ = ()'),
+    (0, ''),
+    (1, 'def __hash__(self):'),
+    (2, 'return hash(frozenset(self.items()))'),
+    (0, ''),
+    (1, 'def __reduce__(self):'),
+    (2, 'return type(self), (dict(self),)'),
+    (0, ''),
+    (1, 'def _immutable(self, *args, **kwargs):'),
+    (2, 'raise TypeError(f"{type(self).__name__} is immutable")'),
+    (0, ''),
+    (1, '__setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _immutable'),
+    (0, ''),
+    (0, ''),
+    (0, 'def _freeze(value):'),
+    (1, 'if isinstance(value, dict):'),
+    (2, 'return _FrozenDict((key, _freeze(item)) for key, item in value.items())'),
+    (1, 'if isinstance(value, (list, tuple)):'),
+    (2, 'return tuple(_freeze(item) for item in value)'),
+    (1, 'return value'),
+    (0, ''),
+    (0, ''),
+    (0, 'def _thaw(value):'),
+    (1, 'if isinstance(value, dict):'),
+    (2, 'return {key: _thaw(item) for key, item in value.items()}'),
+    (1, 'if isinstance(value, tuple):'),
+    (2, 'return [_thaw(item) for item in value]'),
+    (1, 'return value'),
+)
+
+CHECK_TYPE_MAP = {
+    'integer': 'isinstance({value}, bool) or not (isinstance({value}, int) '
+               'or isinstance({value}, float) and {value}.is_integer())',
+    'number': 'isinstance({value}, bool) or not isinstance({value}, (int, float))',
+    'string': 'not isinstance({value}, str)',
+    'array': 'not isinstance({value}, list)',
+    'object': 'not isinstance({value}, dict)',
+    'boolean': 'not isinstance({value}, bool)'
+}
+
+ENUM_CHECK_TYPES = {bool: 'boolean', int: 'number', float: 'number', str: 'string'}
+
+
+def check_code(condition: str, path: str, value: str, message: str, level: int, options: Options) -> List[str]:
+    return [
+        f'{options.spaces(level)}if {condition}:',
+        f'{options.spaces(level + 1)}raise ValidationError({path}, repr({value}) + {repr(" " + message)})'
+    ]
+
+
+def check_bound_code(schema: dict, value: str, path: str, level: int, options: Options) -> List[str]:
+    result = []
+    if 'minimum' in schema:
+        exclusive = schema.get('exclusiveMinimum') is True
+        operator, message = ('<=', 'less than or equal to') if exclusive else ('<', 'less than')
+        condition = f'{value} {operator} {repr(schema["minimum"])}'
+        result += check_code(condition, path, value, f'is {message} the minimum of {schema["minimum"]}', level, options)
+    if 'maximum' in schema:
+        exclusive = schema.get('exclusiveMaximum') is True
+        operator, message = ('>=', 'greater than or equal to') if exclusive else ('>', 'greater than')
+        condition = f'{value} {operator} {repr(schema["maximum"])}'
+        result += check_code(condition, path, value, f'is {message} the maximum of {schema["maximum"]}', level, options)
+    for key, operator, message in (('exclusiveMinimum', '<=', 'less'), ('exclusiveMaximum', '>=', 'greater')):
+        bound = schema.get(key)
+        if not isinstance(bound, bool) and isinstance(bound, (int, float)):
+            condition = f'{value} {operator} {repr(bound)}'
+            result += check_code(condition, path, value, f'is {message} than or equal to {bound}', level, options)
+    return result
+
+
+def check_length_code(
+        schema: dict, value: str, path: str, level: int, prefix: str, options: Options
+) -> List[str]:
+    result = []
+    if f'min{prefix}' in schema:
+        condition = f'len({value}) < {schema[f"min{prefix}"]}'
+        result += check_code(condition, path, value, 'is too short', level, options)
+    if f'max{prefix}' in schema:
+        condition = f'len({value}) > {schema[f"max{prefix}"]}'
+        result += check_code(condition, path, value, 'is too long', level, options)
+    return result
+
+
+def unique_constant(constants: Dict[str, str], name: str, code: str) -> str:
+    constant, index = f'_{name.upper()}', 1
+    while constant in constants:
+        index += 1
+        constant = f'_{name.upper()}_{index}'
+    constants[constant] = code
+    return constant
 
 
 class Item:
-    def __init__(self, name: str):
+    STRUCTURE_IGNORED_KEYS = frozenset({'title', 'description', '$comment', 'examples', 'properties', 'items'})
+
+    def __init__(self, name: str, schema: dict = None):
         self.name = name
+        self.schema = schema if schema is not None else {}
 
     def class_name(self):
         return self.name.title().replace('_', '')
@@ -39,15 +242,70 @@ class Item:
     def is_inner_model(self):
         return False
 
-    def to_init_code(self) -> str:
+    def is_nested(self):
+        return True
+
+    def children(self) -> List['Item']:
+        return []
+
+    def is_lazy(self, options: Options):
+        return options.generate_lazy_properties and not options.generate_frozen_classes and self.is_nested()
+
+    def uses_list(self, options: Options) -> bool:
+        return False
+
+    def uses_columns(self, options: Options) -> bool:
+        return False
+
+    def to_value_code(self, values: str) -> str:
+        raise NotImplementedError  # pragma: no cover
+
+    def to_init_code(self, options: Options) -> str:
+        raise NotImplementedError  # pragma: no cover
+
+    def to_init_value_code(self, options: Options) -> str:
+        return self.to_value_code('values')
+
+    def to_frozen_init_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}set_field(self, "{self.name}", {self.to_init_value_code(options)})'
+
+    def to_replace_value_code(self, options: Options) -> str:
+        return self.to_init_value_code(options)
+
+    def to_list_code(self, options: Options) -> str:
         raise NotImplementedError  # pragma: no cover
 
-    def to_list_code(self) -> str:
+    def to_tuple_code(self) -> str:
         raise NotImplementedError  # pragma: no cover
 
-    def to_class_code(self, level: int = 0, schema: dict = None) -> str:
+    def to_constructor_code(self) -> Optional[str]:
+        return None
+
+    def to_class_code(self, level: int = 0, schema: dict = None, options: Options = None) -> str:
+        writer = CodeWriter(options if options is not None else Options(), level=level)
+        self.write_class_code(writer, schema)
+        return writer.getvalue()
+
+    def write_class_code(self, writer: CodeWriter, schema: dict = None) -> None:
+        stack = [self.class_code_steps(writer, schema)]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            else:
+                stack.append(item.class_code_steps(writer))
+
+    def class_code_steps(self, writer: CodeWriter, schema: dict = None) -> Iterator['Item']:
+        raise ValueError(f'Cannot convert [{self.type_name()}] to class!')
+
+    def to_check_code(
+        self, value: str, path: str, level: int, constants: Dict[str, str], options: Options
+    ) -> List[str]:
         raise NotImplementedError  # pragma: no cover
 
+    def to_dict_code(self, options: Options) -> str:
+        return f'self.{self.name}.to_dict()'
+
 
 class Basic(Item):
     TYPE_MAP = {
@@ -58,101 +316,521 @@ class Basic(Item):
         'object': dict,
         'boolean': bool
     }
+    COLUMN_TYPECODES = {
+        int: 'q',
+        float: 'd',
+        bool: 'B'
+    }
 
-    def __init__(self, name: str, typename: type, default: Any = None):
-        super().__init__(name=name)
+    def __init__(self, name: str, typename: type, default: Any = None, schema: dict = None):
+        super().__init__(name=name, schema=schema)
         self.type = typename
         self.default = default
 
     def type_name(self):
         return self.type.__name__
 
-    def to_init_code(self) -> str:
-        return f'{spaces(2)}self.{self.name}: {self.type_name()} = values.get("{self.name}", {repr(self.default)})'
+    def is_nested(self):
+        return False
 
-    def to_list_code(self) -> str:
-        return f'{spaces(2)}self[:] = values'
+    def to_init_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self.{self.name}: {self.type_name()} = {self.to_init_value_code(options)}'
+
+    def to_init_value_code(self, options: Options) -> str:
+        if options.generate_frozen_classes and self.type is dict:
+            return f'_freeze(values.get("{self.name}", {repr(self.default)}))'
+        return f'values.get("{self.name}", {repr(self.default)})'
+
+    def to_list_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self[:] = values'
+
+    def to_tuple_code(self) -> str:
+        return 'values'
+
+    def to_dict_code(self, options: Options) -> str:
+        if options.generate_frozen_classes and self.type is dict:
+            return f'_thaw(self.{self.name})'
+        return f'self.{self.name}'
+
+    def to_items_code(self, values: str) -> str:
+        return values
+
+    def to_item_default_code(self, value: Any) -> str:
+        return repr(value)
+
+    def column_typecode(self) -> Optional[str]:
+        return self.COLUMN_TYPECODES.get(self.type) if self.default is not None else None
+
+    def to_column_code(self, options: Options) -> List[str]:
+        values = f'value.get("{self.name}", {repr(self.default)}) for value in values'
+        typecode = self.column_typecode()
+        if typecode is None:
+            return [f'{options.spaces(2)}self.{self.name} = [{values}]']
+        return [
+            f'{options.spaces(2)}try:',
+            f'{options.spaces(3)}self.{self.name} = array.array({repr(typecode)}, ({values}))',
+            f'{options.spaces(2)}except (TypeError, OverflowError):',
+            f'{options.spaces(3)}self.{self.name} = [{values}]',
+        ]
+
+    def to_check_code(
+        self, value: str, path: str, level: int, constants: Dict[str, str], options: Options
+    ) -> List[str]:
+        result = []
+        item_type = self.schema.get('type')
+        if item_type in CHECK_TYPE_MAP:
+            condition = CHECK_TYPE_MAP[item_type].format(value=value)
+            result += check_code(condition, path, value, f'is not of type "{item_type}"', level, options)
+        if 'enum' in self.schema:
+            enum_list = self.schema['enum']
+            constant = unique_constant(constants, f'{self.name}_enum', f'frozenset({repr(enum_list)})')
+            check_type = ENUM_CHECK_TYPES.get(type(enum_list[0]))
+            if check_type is None:
+                condition = f'not isinstance({value}, (int, float, str)) or {value} not in cls.{constant}'
+            else:
+                condition = f'{CHECK_TYPE_MAP[check_type].format(value=value)} or {value} not in cls.{constant}'
+            result += check_code(condition, path, value, f'is not one of {json.dumps(enum_list)}', level, options)
+
+        bound_code = check_bound_code(self.schema, value, path, level + (item_type is None), options)
+        if bound_code and item_type is None:
+            bound_code = [f'{options.spaces(level)}if isinstance({value}, (int, float)):'] + bound_code
+        length_code = check_length_code(self.schema, value, path, level + (item_type is None), 'Length', options)
+        if length_code and item_type is None:
+            length_code = [f'{options.spaces(level)}if isinstance({value}, str):'] + length_code
+        return result + bound_code + length_code
+
+
+class Enumeration(Basic):
+    MIXINS = {
+        str: '(str, enum.Enum)',
+        int: '(enum.IntEnum)',
+        float: '(float, enum.Enum)'
+    }
 
-    def to_class_code(self, level: int = 0, schema: dict = None):
-        raise ValueError(f'Cannot convert [{self.type_name()}] to class!')
+    def __init__(
+        self, name: str, typename: type, values: list, default: Any = None, schema: dict = None,
+        owner: 'Enumeration' = None
+    ):
+        super().__init__(name=name, typename=typename, default=default, schema=schema)
+        self.owner = owner if owner is not None else self
+        self.class_type = name
+        self.members = self.member_names(values) if owner is None else owner.members
+
+    def check_default(self, name: str, defaults: list) -> None:
+        for value in defaults:
+            if value not in self.members:
+                raise ValueError(
+                    f'Default {repr(value)} of "{name}" is not one of its enum values {list(self.members)}'
+                )
+
+    @staticmethod
+    def member_names(values: list) -> Dict[Any, str]:
+        members = OrderedDict()
+        for value in values:
+            name = re.sub(r'\W+', '_', str(value)).strip('_').upper()
+            if not name or not name[0].isalpha():
+                name = f'VALUE_{name}'.rstrip('_')
+            member, suffix = name, 1
+            while member in members.values():
+                suffix += 1
+                member = f'{name}_{suffix}'
+            members[value] = member
+        return members
+
+    def class_name(self):
+        return self.owner.class_type.title().replace('_', '')
+
+    def type_name(self):
+        return self.class_name()
+
+    def lookup_name(self) -> str:
+        return f'_{self.owner.class_type.upper()}_VALUES'
+
+    def to_init_value_code(self, options: Options) -> str:
+        return f'{self.lookup_name()}[{super().to_init_value_code(options)}]'
+
+    def to_list_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self[:] = {self.to_items_code("values")}'
+
+    def to_tuple_code(self) -> str:
+        return self.to_items_code('values')
+
+    def to_items_code(self, values: str) -> str:
+        return f'[{self.lookup_name()}[value] for value in {values}]'
+
+    def to_item_default_code(self, value: Any) -> str:
+        return f'{self.class_name()}.{self.members[value]}'
+
+    def column_typecode(self) -> Optional[str]:
+        return None
+
+    def to_column_code(self, options: Options) -> List[str]:
+        value = f'value.get("{self.name}", {repr(self.default)})'
+        return [f'{options.spaces(2)}self.{self.name} = [{self.lookup_name()}[{value}] for value in values]']
+
+    def write_enum_code(self, writer: CodeWriter) -> None:
+        writer.line(f'class {self.class_name()}{self.MIXINS[self.type]}:')
+        for value, member in self.members.items():
+            writer.line(f'{member} = {repr(value)}', 1)
+        writer.line()
+        writer.line()
+        writer.line(f'{self.lookup_name()} = EnumLookup({self.class_name()})')
 
 
 class Definition(Item):
-    def __init__(self, name: str, class_type: str, path: str):
-        super().__init__(name=name)
+    def __init__(self, name: str, class_type: str, path: str, schema: dict = None):
+        super().__init__(name=name, schema=schema)
         self.path = path
         self.class_type = class_type
 
     def class_name(self):
         return self.class_type.title().replace('_', '')
 
-    def to_init_code(self) -> str:
-        return f'{spaces(2)}self.{self.name} = {self.class_name()}(values=values.get("{self.name}"))'
+    def to_value_code(self, values: str) -> str:
+        return f'{self.class_name()}(values={values}.get("{self.name}"))'
 
-    def to_list_code(self) -> str:
-        return f'{spaces(2)}self[:] = [{self.class_name()}(value) for value in values]'
+    def to_init_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self.{self.name} = {self.to_value_code("values")}'
 
-    def to_class_code(self, level: int = 0, schema: dict = None) -> str:
-        raise ValueError(f'Cannot convert [{self.type_name()}] to class!')
+    def to_list_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self[:] = [{self.class_name()}(value) for value in values]'
+
+    def to_tuple_code(self) -> str:
+        return f'[{self.class_name()}(value) for value in values]'
+
+    def to_constructor_code(self) -> Optional[str]:
+        return self.class_name()
+
+    def to_replace_value_code(self, options: Options) -> str:
+        value = f'values["{self.name}"]'
+        return f'{value} if isinstance({value}, {self.class_name()}) else {self.to_init_value_code(options)}'
+
+    def to_check_code(
+        self, value: str, path: str, level: int, constants: Dict[str, str], options: Options
+    ) -> List[str]:
+        return [f'{options.spaces(level)}{self.class_name()}._check({value}, {path})']
 
 
 class Model(Item):
-    def __init__(self, name: str, default: Any = None):
-        super().__init__(name=name)
+    def __init__(self, name: str, default: Any = None, schema: dict = None):
+        super().__init__(name=name, schema=schema)
         self.properties: List[Item] = []
         self.default = default or {}
 
     def is_inner_model(self):
         return True
 
+    def children(self) -> List[Item]:
+        return self.properties
+
     def inner_models(self) -> List['Model']:
         return [item for item in self.properties if item.is_inner_model() and isinstance(item, Model)]
 
-    def to_init_code(self):
-        return f'{spaces(2)}self.{self.name} = self.{self.class_name()}(values=values.get("{self.name}"))'
+    def uses_list(self, options: Options) -> bool:
+        stack = [self]
+        while stack:
+            model = stack.pop()
+            for item in model.properties:
+                if isinstance(item, Array) and not isinstance(model, Array) and not item.is_lazy(options):
+                    return True
+                if isinstance(item, Model):
+                    stack.append(item)
+        return False
+
+    def uses_frozen_values(self, options: Options) -> bool:
+        if not options.generate_frozen_classes:
+            return False
+        stack = [self]
+        while stack:
+            model = stack.pop()
+            for item in model.properties:
+                if isinstance(item, Basic) and item.type is dict:
+                    return True
+                if isinstance(item, Array) and not item.is_inner_model():
+                    return True
+                if isinstance(item, Model):
+                    stack.append(item)
+        return False
+
+    def uses_columns(self, options: Options) -> bool:
+        stack = [self]
+        while stack:
+            model = stack.pop()
+            if isinstance(model, Array) and model.is_columnar(options):
+                return True
+            stack += [item for item in model.properties if isinstance(item, Model)]
+        return False
 
-    def to_list_code(self) -> str:
-        return f'{spaces(2)}self[:] = [self.{self.class_name()}(value) for value in values]'
+    def to_value_code(self, values: str) -> str:
+        return f'self.{self.class_name()}(values={values}.get("{self.name}"))'
+
+    def to_init_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self.{self.name} = {self.to_value_code("values")}'
+
+    def to_list_code(self, options: Options) -> str:
+        return f'{options.spaces(2)}self[:] = [self.{self.class_name()}(value) for value in values]'
+
+    def to_tuple_code(self) -> str:
+        return f'[cls.{self.class_name()}(value) for value in values]'
+
+    def to_constructor_code(self) -> Optional[str]:
+        return f'cls.{self.class_name()}'
+
+    def to_replace_value_code(self, options: Options) -> str:
+        value = f'values["{self.name}"]'
+        return f'{value} if isinstance({value}, self.{self.class_name()}) else {self.to_init_value_code(options)}'
+
+    @staticmethod
+    def generate_schema_code(writer: CodeWriter, schema: dict) -> None:
+        options = writer.options
+        if options.generate_validate_code and schema is not None:
+            lines = f'SCHEMA = json.loads("""{json.dumps(schema, indent=options.indent)}""")'.splitlines()
+            lines.append('VALIDATOR = jsonschema.validators.validator_for(SCHEMA)(SCHEMA)')
+            lines.append('VALIDATOR.check_schema(SCHEMA)')
+            with writer.indent():
+                writer.extend(lines)
+            writer.line()
 
     @staticmethod
-    def generate_schema_code(result: List[str], schema: dict = None) -> None:
-        if Config.generate_validate_code and schema is not None:
-            lines = f'SCHEMA = json.loads("""{json.dumps(schema, indent=Config.indent)}""")'.splitlines()
-            result += [indent_line(line, 1) for line in lines] + ['']
+    @contextmanager
+    def generate_instrumentation_code(writer: CodeWriter, owner: str = 'self'):
+        if not writer.options.generate_instrumentation:
+            yield
+            return
+        writer.line('start = _STATS.begin()', 2)
+        writer.line('try:', 2)
+        with writer.indent():
+            yield
+        writer.line('finally:', 2)
+        cls = 'cls' if owner == 'cls' else 'type(self)'
+        writer.line(f'_STATS.end({owner}._STATS_KEY, start, {cls})', 3)
 
     @staticmethod
-    def generate_validate_code(result: List[str], schema: dict = None) -> None:
-        if Config.generate_validate_code and schema is not None:
-            result.append(f'{spaces(2)}jsonschema.validate(values, self.SCHEMA)')
+    def generate_stats_key_code(writer: CodeWriter) -> None:
+        if writer.options.generate_instrumentation:
+            writer.line('_STATS_KEY = f"{__module__}.{__qualname__}"', 1)
+            writer.line()
 
-    def generate_inner_modes_code(self, result: List[str]) -> None:
+    @staticmethod
+    def generate_validate_code(writer: CodeWriter, schema: dict, owner: str = 'self') -> None:
+        if writer.options.generate_validate_code and schema is not None:
+            writer.line(f'{owner}.VALIDATOR.validate(values)', 2)
+        if writer.options.generate_inline_validate_code and schema is not None:
+            writer.line(f'{owner}._check(values)', 2)
+
+    def to_check_code(
+        self, value: str, path: str, level: int, constants: Dict[str, str], options: Options
+    ) -> List[str]:
+        return [f'{options.spaces(level)}cls.{self.class_name()}._check({value}, {path})']
+
+    def generate_check_body_code(self, constants: Dict[str, str], options: Options) -> List[str]:
+        condition = CHECK_TYPE_MAP['object'].format(value='values')
+        result = check_code(condition, 'path', 'values', 'is not of type "object"', 2, options)
+        for name in self.schema.get('required', []):
+            result += [
+                f'{options.spaces(2)}if "{name}" not in values:',
+                f'{options.spaces(3)}raise ValidationError(path, {repr(repr(name) + " is a required property")})'
+            ]
+        if self.schema.get('additionalProperties') is False:
+            names = [item.name for item in self.properties]
+            constant = unique_constant(constants, 'properties', f'frozenset({repr(names)})')
+            result += [
+                f'{options.spaces(2)}if not cls.{constant}.issuperset(values):',
+                f'{options.spaces(3)}raise ValidationError(path, "Additional properties are not allowed")'
+            ]
+        for item in self.properties:
+            lines = item.to_check_code('value', f'path + {repr("." + item.name)}', 3, constants, options)
+            if lines:
+                result.append(f'{options.spaces(2)}if "{item.name}" in values:')
+                result.append(f'{options.spaces(3)}value = values["{item.name}"]')
+                result += lines
+        return result
+
+    def generate_check_code(self, writer: CodeWriter) -> None:
+        options = writer.options
+        if not options.generate_inline_validate_code:
+            return
+        constants: Dict[str, str] = {}
+        body = self.generate_check_body_code(constants, options)
+        if constants:
+            for name, code in constants.items():
+                writer.line(f'{name} = {code}', 1)
+            writer.line()
+        writer.line('@classmethod', 1)
+        writer.line('def _check(cls, values, path: str = "$"):', 1)
+        writer.extend(body)
+        writer.line()
+
+    def lazy_properties(self, options: Options) -> List[Item]:
+        return [item for item in self.properties if item.is_lazy(options)]
+
+    def slot_names(self, options: Options) -> tuple:
+        names = tuple(f'_{item.name}' if item.is_lazy(options) else item.name for item in self.properties)
+        if options.generate_frozen_classes:
+            return names + ('_hash',)
+        return names + ('_values',) if self.lazy_properties(options) else names
+
+    def generate_slots_code(self, writer: CodeWriter) -> None:
+        if writer.options.generate_slots:
+            writer.line(f'__slots__ = {repr(self.slot_names(writer.options))}', 1)
+            writer.line()
+
+    def generate_inner_modes_code(self, writer: CodeWriter) -> Iterator[Item]:
         for item in self.inner_models():
-            result.append(item.to_class_code(level=1))
-            result.append('')
-
-    def to_class_code(self, level: int = 0, schema: dict = None) -> str:
-        result = [f'class {self.class_name()}:']
-        self.generate_schema_code(result, schema)
-        self.generate_inner_modes_code(result)
-        result.append(f'{spaces(1)}def __init__(self, values: dict = None):')
-        result.append(f'{spaces(2)}values = values if values is not None else {repr(self.default)}')
-        self.generate_validate_code(result, schema)
-        result.append(Config.line_break.join(item.to_init_code() for item in self.properties))
-        if Config.generate_repr_method:
-            result.append('')
-            result.append(f'{spaces(1)}def __repr__(self):')
-            result.append(f'{spaces(2)}return "{self.class_name()}[" + ", ".join((')
+            with writer.indent():
+                yield item
+            writer.line()
+
+    def class_code_steps(self, writer: CodeWriter, schema: dict = None) -> Iterator[Item]:
+        options = writer.options
+        writer.line(f'class {self.class_name()}:')
+        self.generate_slots_code(writer)
+        self.generate_stats_key_code(writer)
+        self.generate_schema_code(writer, schema)
+        yield from self.generate_inner_modes_code(writer)
+        self.generate_check_code(writer)
+        writer.line('def __init__(self, values: dict = None):', 1)
+        with self.generate_instrumentation_code(writer):
+            writer.line(f'values = values if values is not None else {repr(self.default)}', 2)
+            self.generate_validate_code(writer, schema)
+            if self.lazy_properties(options):
+                writer.line('self._values = values', 2)
+            if options.generate_frozen_classes:
+                writer.line('set_field = object.__setattr__', 2)
+                writer.extend([item.to_frozen_init_code(options) for item in self.properties])
+                writer.line('set_field(self, "_hash", None)', 2)
+            else:
+                writer.extend([
+                    f'{options.spaces(2)}self._{item.name} = None' if item.is_lazy(options)
+                    else item.to_init_code(options)
+                    for item in self.properties
+                ])
+        for item in self.lazy_properties(options):
+            writer.line()
+            writer.line('@property', 1)
+            writer.line(f'def {item.name}(self):', 1)
+            writer.line(f'if self._{item.name} is None:', 2)
+            writer.line(f'self._{item.name} = {item.to_value_code("self._values")}', 3)
+            writer.line(f'return self._{item.name}', 2)
+            writer.line()
+            writer.line(f'@{item.name}.setter', 1)
+            writer.line(f'def {item.name}(self, value):', 1)
+            writer.line(f'self._{item.name} = value', 2)
+        if options.generate_repr_method:
+            writer.line()
+            writer.line('def __repr__(self):', 1)
+            writer.line(f'return "{self.class_name()}[" + ", ".join((', 2)
             for item in self.properties:
-                result.append(f'{spaces(3)}f"{item.name}: {{repr(self.{item.name})}}",')
-            result.append(f'{spaces(2)})) + "]"')
-        return indent_class(code=Config.line_break.join(result), level=level)
+                writer.line(f'f"{item.name}: {{repr(self.{item.name})}}",', 3)
+            writer.line(')) + "]"', 2)
+        if options.generate_to_dict_method:
+            writer.line()
+            writer.line('def to_dict(self) -> dict:', 1)
+            writer.line('return {', 2)
+            for item in self.properties:
+                writer.line(f'"{item.name}": {item.to_dict_code(options)},', 3)
+            writer.line('}', 2)
+            self.generate_to_json_code(writer)
+        self.generate_stream_code(writer, 'cls')
+        self.generate_frozen_code(writer)
+        self.generate_pickle_code(writer)
+
+    def fields_code(self) -> str:
+        names = [f'self.{item.name}' for item in self.properties]
+        return f'({", ".join(names)}{"," * (len(names) == 1)})'
+
+    def generate_frozen_code(self, writer: CodeWriter) -> None:
+        if not writer.options.generate_frozen_classes:
+            return
+        names = tuple(item.name for item in self.properties)
+        writer.line()
+        writer.line(f'_FIELDS = {repr(names)}', 1)
+        writer.line()
+        writer.line('def __setattr__(self, name, value):', 1)
+        writer.line('raise AttributeError(f"{type(self).__name__} is frozen")', 2)
+        writer.line()
+        writer.line('def __delattr__(self, name):', 1)
+        writer.line('raise AttributeError(f"{type(self).__name__} is frozen")', 2)
+        writer.line()
+        writer.line('def _key(self) -> tuple:', 1)
+        writer.line(f'return {self.fields_code()}', 2)
+        writer.line()
+        writer.line('def __eq__(self, other):', 1)
+        writer.line('return self is other or (type(other) is type(self) and self._key() == other._key())', 2)
+        writer.line()
+        writer.line('def __hash__(self):', 1)
+        writer.line('if self._hash is None:', 2)
+        writer.line('object.__setattr__(self, "_hash", hash(self._key()))', 3)
+        writer.line('return self._hash', 2)
+        writer.line()
+        writer.line('def replace(self, **changes):', 1)
+        writer.line('unknown = set(changes).difference(self._FIELDS)', 2)
+        writer.line('if unknown:', 2)
+        writer.line('raise TypeError(f"Unknown fields {sorted(unknown)}")', 3)
+        writer.line('clone = object.__new__(type(self))', 2)
+        writer.line('set_field = object.__setattr__', 2)
+        writer.line('for name in self._FIELDS:', 2)
+        writer.line('set_field(clone, name, getattr(self, name))', 3)
+        writer.line('values = changes', 2)
+        for item in self.properties:
+            writer.line(f'if "{item.name}" in values:', 2)
+            writer.line(f'set_field(clone, "{item.name}", {item.to_replace_value_code(writer.options)})', 3)
+        writer.line('set_field(clone, "_hash", None)', 2)
+        writer.line('return clone', 2)
+
+    def generate_pickle_code(self, writer: CodeWriter) -> None:
+        options = writer.options
+        if not options.generate_pickle_methods and not options.generate_frozen_classes:
+            return
+        writer.line()
+        writer.line('def __getstate__(self) -> tuple:', 1)
+        writer.line(f'return {"self._key()" if options.generate_frozen_classes else self.fields_code()}', 2)
+        writer.line()
+        writer.line('def __setstate__(self, state: tuple):', 1)
+        if options.generate_frozen_classes:
+            writer.line('set_field = object.__setattr__', 2)
+            writer.line('for name, value in zip(self._FIELDS, state):', 2)
+            writer.line('set_field(self, name, value)', 3)
+            writer.line('set_field(self, "_hash", None)', 2)
+            return
+        if self.lazy_properties(options):
+            writer.line('self._values = {}', 2)
+        if self.properties:
+            writer.line(f'{self.fields_code()[1:-1]} = state', 2)
+        elif not self.lazy_properties(options):
+            writer.line('pass', 2)
 
+    @staticmethod
+    def generate_to_json_code(writer: CodeWriter) -> None:
+        writer.line()
+        writer.line('def to_json(self, **kwargs) -> str:', 1)
+        writer.line('return json.dumps(self.to_dict(), **kwargs)', 2)
+
+    @staticmethod
+    def generate_stream_code(writer: CodeWriter, constructor: Optional[str]) -> None:
+        if not writer.options.generate_stream_methods:
+            return
+        writer.line()
+        writer.line('@classmethod', 1)
+        writer.line('def from_records(cls, records):', 1)
+        if constructor is None:
+            writer.line('yield from records', 2)
+        else:
+            if constructor != 'cls':
+                writer.line(f'constructor = {constructor}', 2)
+                constructor = 'constructor'
+            writer.line('for values in records:', 2)
+            writer.line(f'yield {constructor}(values)', 3)
+        writer.line()
+        writer.line('@classmethod', 1)
+        writer.line('def iter_ndjson(cls, fileobj):', 1)
+        writer.line('loads = json.loads', 2)
+        writer.line('return cls.from_records(loads(line) for line in fileobj if line.strip())', 2)
 
-class Array(Model):
-    use_list = False
 
-    def __init__(self, name: str, items: Item = None, default: Any = None):
-        super().__init__(name=name)
+class Array(Model):
+    def __init__(self, name: str, items: Item = None, default: Any = None, schema: dict = None):
+        super().__init__(name=name, schema=schema)
         self.items = items
         self.properties.append(items)
         self.default = default
@@ -160,192 +838,1506 @@ class Array(Model):
     def is_inner_model(self):
         return not isinstance(self.items, Basic)
 
-    def to_init_code(self) -> str:
-        Array.use_list = True
+    def is_nested(self):
+        return self.is_inner_model()
+
+    def is_columnar(self, options: Options) -> bool:
+        return options.generate_columnar_arrays and not options.generate_frozen_classes and type(self.items) is Model \
+            and all(isinstance(item, Basic) for item in self.items.properties)
+
+    def slot_names(self, options: Options) -> tuple:
+        if self.is_columnar(options):
+            return tuple(item.name for item in self.items.properties) + ('_size',)
+        return ()
+
+    def to_dict_code(self, options: Options) -> str:
+        if self.is_inner_model():
+            return super().to_dict_code(options)
+        return f'_thaw(self.{self.name})' if options.generate_frozen_classes else f'self.{self.name}'
+
+    def to_constructor_code(self) -> Optional[str]:
+        return super().to_constructor_code() if self.is_inner_model() else None
+
+    def to_items_value_code(self, container: str) -> str:
+        items = self.items.to_items_code(f'values["{self.name}"]')
+        codes = [self.items.to_item_default_code(value) for value in self.default or []]
+        if container == 'tuple':
+            items, default = f'tuple({items})', f'({", ".join(codes)}{"," * (len(codes) == 1)})'
+        else:
+            default = f'[{", ".join(codes)}]'
+        default = default if self.default is not None else 'None'
+        return f'{items} if values.get("{self.name}") is not None else {default}'
+
+    def to_init_code(self, options: Options) -> str:
         if not self.is_inner_model():
-            return '{spaces}self.{name}: {type_name} = values.get("{name}", {default})'.format(
-                spaces=spaces(2),
+            return '{spaces}self.{name}: {type_name} = {value}'.format(
+                spaces=options.spaces(2),
                 name=self.name,
                 type_name=f'List[{self.items.type_name()}]',
-                default=repr(self.default)
+                value=self.to_items_value_code('list') if isinstance(self.items, Enumeration)
+                else f'values.get("{self.name}", {repr(self.default)})'
             )
 
-        return '{spaces}self.{name}: List[{item_type}] = self.{class_name}(values=values.get("{name}"))'.format(
-            spaces=spaces(2),
+        return '{spaces}self.{name}: List[{item_type}] = {value}'.format(
+            spaces=options.spaces(2),
             name=self.name,
-            class_name=self.class_name(),
+            value=self.to_value_code('values'),
             item_type=self.items.type_name()
         )
 
-    def to_class_code(self, level: int = 0, schema: dict = None) -> str:
-        result = [f'class {self.class_name()}(list):']
-        self.generate_schema_code(result, schema)
-        self.generate_inner_modes_code(result)
-        result.append(f'{spaces(1)}def __init__(self, values: list = None):')
-        result.append(f'{spaces(2)}super().__init__()')
-        result.append(f'{spaces(2)}values = values if values is not None else {repr(self.default or [])}')
-        self.generate_validate_code(result, schema)
-        result.append(self.items.to_list_code())
-        code = Config.line_break.join(result)
-        return indent_class(code=code, level=level)
+    def to_init_value_code(self, options: Options) -> str:
+        if self.is_inner_model():
+            return super().to_init_value_code(options)
+        if self.items.type is dict:
+            return f'_freeze({self.to_items_value_code("tuple")})'
+        return self.to_items_value_code('tuple')
+
+    def to_replace_value_code(self, options: Options) -> str:
+        if self.is_inner_model():
+            return super().to_replace_value_code(options)
+        return self.to_init_value_code(options)
+
+    def to_check_code(
+        self, value: str, path: str, level: int, constants: Dict[str, str], options: Options
+    ) -> List[str]:
+        if self.is_inner_model():
+            return super().to_check_code(value, path, level, constants, options)
+        return self.generate_inline_check_code(value, path, level, constants, options)
+
+    def generate_inline_check_code(
+        self, value: str, path: str, level: int, constants: Dict[str, str], options: Options
+    ) -> List[str]:
+        condition = CHECK_TYPE_MAP['array'].format(value=value)
+        result = check_code(condition, path, value, 'is not of type "array"', level, options)
+        result += check_length_code(self.schema, value, path, level, 'Items', options)
+        index, item = f'index_{level}', f'item_{level}'
+        lines = self.items.to_check_code(item, f"{path} + '[' + str({index}) + ']'", level + 1, constants, options)
+        if lines:
+            result.append(f'{options.spaces(level)}for {index}, {item} in enumerate({value}):')
+            result += lines
+        return result
+
+    def generate_check_body_code(self, constants: Dict[str, str], options: Options) -> List[str]:
+        return self.generate_inline_check_code('values', 'path', 2, constants, options)
+
+    def class_code_steps(self, writer: CodeWriter, schema: dict = None) -> Iterator[Item]:
+        options = writer.options
+        if self.is_columnar(options):
+            yield from self.columnar_class_code_steps(writer, schema)
+            return
+        if options.generate_frozen_classes:
+            yield from self.frozen_class_code_steps(writer, schema)
+            return
+        writer.line(f'class {self.class_name()}(list):')
+        self.generate_slots_code(writer)
+        self.generate_stats_key_code(writer)
+        self.generate_schema_code(writer, schema)
+        yield from self.generate_inner_modes_code(writer)
+        self.generate_check_code(writer)
+        writer.line('def __init__(self, values: list = None):', 1)
+        with self.generate_instrumentation_code(writer):
+            writer.line('super().__init__()', 2)
+            writer.line(f'values = values if values is not None else {repr(self.default or [])}', 2)
+            self.generate_validate_code(writer, schema)
+            writer.extend([self.items.to_list_code(options)])
+        if options.generate_to_dict_method:
+            writer.line()
+            writer.line('def to_dict(self) -> list:', 1)
+            if self.is_inner_model():
+                writer.line('return [value.to_dict() for value in self]', 2)
+            else:
+                writer.line('return list(self)', 2)
+            self.generate_to_json_code(writer)
+        self.generate_stream_code(writer, self.items.to_constructor_code())
+
+    def frozen_class_code_steps(self, writer: CodeWriter, schema: dict = None) -> Iterator[Item]:
+        options = writer.options
+        writer.line(f'class {self.class_name()}(tuple):')
+        writer.line('__slots__ = ()', 1)
+        writer.line()
+        self.generate_stats_key_code(writer)
+        self.generate_schema_code(writer, schema)
+        yield from self.generate_inner_modes_code(writer)
+        self.generate_check_code(writer)
+        writer.line('def __new__(cls, values: list = None):', 1)
+        with self.generate_instrumentation_code(writer, 'cls'):
+            writer.line(f'values = values if values is not None else {repr(self.default or [])}', 2)
+            self.generate_validate_code(writer, schema, owner='cls')
+            writer.line(f'return super().__new__(cls, {self.items.to_tuple_code()})', 2)
+        writer.line()
+        writer.line('def __reduce__(self):', 1)
+        writer.line('return tuple.__new__, (type(self), tuple(self))', 2)
+        if options.generate_to_dict_method:
+            writer.line()
+            writer.line('def to_dict(self) -> list:', 1)
+            if self.is_inner_model():
+                writer.line('return [value.to_dict() for value in self]', 2)
+            else:
+                writer.line('return list(self)', 2)
+            self.generate_to_json_code(writer)
+        self.generate_stream_code(writer, self.items.to_constructor_code())
+
+    def generate_row_code(self, writer: CodeWriter) -> None:
+        options = writer.options
+        properties = self.items.properties
+        writer.line('class Row:')
+        writer.line("__slots__ = ('_table', '_index')", 1)
+        writer.line()
+        writer.line('def __init__(self, table, index: int):', 1)
+        writer.line('self._table = table', 2)
+        writer.line('self._index = index', 2)
+        for item in properties:
+            value = f'self._table.{item.name}[self._index]'
+            writer.line()
+            writer.line('@property', 1)
+            writer.line(f'def {item.name}(self):', 1)
+            if item.column_typecode() == 'B':
+                writer.line(f'value = {value}', 2)
+                writer.line('return bool(value) if type(value) is int else value', 2)
+            else:
+                writer.line(f'return {value}', 2)
+            writer.line()
+            writer.line(f'@{item.name}.setter', 1)
+            writer.line(f'def {item.name}(self, value):', 1)
+            if item.column_typecode() is None:
+                writer.line(f'{value} = value', 2)
+            else:
+                writer.line('try:', 2)
+                writer.line(f'{value} = value', 3)
+                writer.line('except (TypeError, OverflowError):', 2)
+                writer.line(f'self._table.{item.name} = self._table.{item.name}.tolist()', 3)
+                writer.line(f'{value} = value', 3)
+        if options.generate_repr_method:
+            writer.line()
+            writer.line('def __repr__(self):', 1)
+            writer.line(f'return "{self.items.class_name()}[" + ", ".join((', 2)
+            for item in properties:
+                writer.line(f'f"{item.name}: {{repr(self.{item.name})}}",', 3)
+            writer.line(')) + "]"', 2)
+        if options.generate_to_dict_method:
+            writer.line()
+            writer.line('def to_dict(self) -> dict:', 1)
+            writer.line('return {', 2)
+            for item in properties:
+                writer.line(f'"{item.name}": self.{item.name},', 3)
+            writer.line('}', 2)
+
+    def columnar_class_code_steps(self, writer: CodeWriter, schema: dict = None) -> Iterator[Item]:
+        options = writer.options
+        writer.line(f'class {self.class_name()}:')
+        self.generate_slots_code(writer)
+        self.generate_stats_key_code(writer)
+        self.generate_schema_code(writer, schema)
+        yield from self.generate_inner_modes_code(writer)
+        with writer.indent():
+            self.generate_row_code(writer)
+        writer.line()
+        self.generate_check_code(writer)
+        writer.line('def __init__(self, values: list = None):', 1)
+        with self.generate_instrumentation_code(writer):
+            writer.line(f'values = values if values is not None else {repr(self.default or [])}', 2)
+            self.generate_validate_code(writer, schema)
+            writer.line('self._size = len(values)', 2)
+            for item in self.items.properties:
+                writer.extend(item.to_column_code(options))
+        writer.line()
+        writer.line('def __len__(self):', 1)
+        writer.line('return self._size', 2)
+        writer.line()
+        writer.line('def __getitem__(self, index):', 1)
+        writer.line('if isinstance(index, slice):', 2)
+        writer.line('return [self.Row(self, position) for position in range(*index.indices(self._size))]', 3)
+        writer.line('if index < 0:', 2)
+        writer.line('index += self._size', 3)
+        writer.line('if not 0 <= index < self._size:', 2)
+        writer.line('raise IndexError("index out of range")', 3)
+        writer.line('return self.Row(self, index)', 2)
+        writer.line()
+        writer.line('def __iter__(self):', 1)
+        writer.line('row = self.Row', 2)
+        writer.line('return (row(self, index) for index in range(self._size))', 2)
+        if options.generate_to_dict_method:
+            writer.line()
+            writer.line('def to_dict(self) -> list:', 1)
+            writer.line('return [row.to_dict() for row in self]', 2)
+            self.generate_to_json_code(writer)
+        self.generate_stream_code(writer, self.items.to_constructor_code())
+
+
+class SchemaStore:
+    def __init__(self):
+        self.documents: Dict[Path, dict] = {}
+        self.lock = threading.Lock()
+
+    def load(self, schema_path: Path) -> dict:
+        schema_path = Path(os.path.abspath(str(schema_path)))
+        with self.lock:
+            document = self.documents.get(schema_path)
+        if document is None:
+            with open(str(schema_path), encoding='utf-8') as f:
+                document = json.load(f)
+            with self.lock:
+                document = self.documents.setdefault(schema_path, document)
+        return document
+
+    def discard(self, schema_path: Path) -> None:
+        with self.lock:
+            self.documents.pop(Path(os.path.abspath(str(schema_path))), None)
+
+    @staticmethod
+    def resolve_pointer(document: dict, pointer: str) -> Any:
+        node = document
+        for token in pointer.split('/')[1:]:
+            token = token.replace('~1', '/').replace('~0', '~')
+            try:
+                node = node[int(token)] if isinstance(node, list) else node[token]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise ValueError(f'Cannot resolve pointer {repr(pointer)}') from None
+        return node
 
 
 class Parser:
-    def __init__(self):
+    MAX_CLASS_DEPTH = 32
+
+    def __init__(
+        self, options: Options = None, schema_path: Path = None, store: SchemaStore = None, package: bool = False
+    ):
+        self.options = options if options is not None else Options()
         self.definitions: Dict[str, Item] = {}
         self.root: Optional[Item] = None
+        self.deduplicated = 0
+        self.schema_path = Path(os.path.abspath(str(schema_path))) if schema_path is not None else None
+        self.store = store if store is not None else SchemaStore()
+        self.package = package
+        self.imports: Dict[str, set] = {}
+        self.used_names: set = set()
+        self.class_types: Dict[str, str] = {}
+        self.dependencies: set = set()
+        self.enums: Dict[str, Enumeration] = {}
+        self.document_path = self.schema_path
+        self.document: Optional[dict] = None
+        self.timings: Dict[str, float] = {}
+
+    def items(self) -> List[Item]:
+        return [*self.definitions.values(), *([self.root] if self.root is not None else [])]
+
+    @contextmanager
+    def timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    @contextmanager
+    def use_document(self, document_path: Optional[Path], document: dict):
+        last = self.document_path, self.document
+        self.document_path, self.document = document_path, document
+        try:
+            yield
+        finally:
+            self.document_path, self.document = last
+
+    def parse_reference(self, name: str, schema: dict) -> Item:
+        ref: str = schema['$ref']
+        location, _, pointer = ref.partition('#')
+        if not location:
+            if self.document_path == self.schema_path and pointer.startswith('/definitions/') \
+                    and pointer.count('/') == 2:
+                return Definition(name=name, class_type=pointer.split('/')[-1], path=ref, schema=schema)
+            document_path, document = self.document_path, self.document
+        else:
+            if self.document_path is None:
+                raise ValueError(f'Cannot resolve {repr(ref)} without a schema path')
+            document_path = Path(os.path.normpath(str(self.document_path.parent / location)))
+            self.dependencies.add(document_path)
+            document = self.store.load(document_path)
+
+        target = self.store.resolve_pointer(document, pointer)
+        class_type = pointer.split('/')[-1] if pointer else document.get('title', document_path.stem)
+        path = f'{document_path}#{pointer}' if document_path is not None else ref
+        if location and self.package and document_path.parent == self.schema_path.parent \
+                and (not pointer or pointer.startswith('/definitions/') and pointer.count('/') == 2):
+            imported, alias = Item(name=class_type).class_name(), self.reserve_class_type(path, class_type)
+            imported_as = Item(name=alias).class_name()
+            clause = imported if imported_as == imported else f'{imported} as {imported_as}'
+            self.imports.setdefault(document_path.stem, set()).add(clause)
+            return Definition(name=name, class_type=alias, path=ref, schema=schema)
+        if not isinstance(target, dict) or target.get('type') != 'object' or 'properties' not in target:
+            with self.use_document(document_path, document):
+                return self.parse_definition(name=name, schema=target)
+
+        class_type = self.reserve_class_type(path, class_type)
+        if path not in self.definitions:
+            self.definitions[path] = Model(name=class_type)
+            with self.use_document(document_path, document):
+                self.definitions[path] = self.parse_definition(name=class_type, schema=target)
+        return Definition(name=name, class_type=class_type, path=path, schema=schema)
+
+    def reserve_class_type(self, path: str, class_type: str) -> str:
+        if path not in self.class_types:
+            name, index_suffix = class_type, 1
+            while Item(name=name).class_name() in self.used_names:
+                index_suffix += 1
+                name = f'{class_type}_{index_suffix}'
+            self.used_names.add(Item(name=name).class_name())
+            self.class_types[path] = name
+        return self.class_types[path]
+
+    @staticmethod
+    def pending_children(item: Item) -> List[Tuple[Item, str, dict]]:
+        if isinstance(item, Array) and item.items is None:
+            return [(item, 'items', item.schema['items'])]
+        if type(item) is Model and not item.properties:
+            return [(item, name, definition) for name, definition in item.schema.get('properties', {}).items()]
+        return []
+
+    def expand(self, item: Item) -> Item:
+        stack = self.pending_children(item)[::-1]
+        while stack:
+            parent, name, definition = stack.pop()
+            child = self.create_definition(name=name, schema=definition)
+            if isinstance(parent, Array):
+                parent.items = parent.properties[0] = child
+                if isinstance(child, Enumeration):
+                    child.check_default(parent.name, parent.default or [])
+                    if child.owner is child:
+                        child.class_type = parent.name
+            else:
+                parent.properties.append(child)
+            stack += self.pending_children(child)[::-1]
+        return item
 
     def parse_object(self, name: str, schema: dict) -> Model:
-        model = Model(name=name)
-        for name, definition in schema.get('properties', {}).items():
-            item = self.parse_definition(name=name, schema=definition)
-            model.properties.append(item)
-        return model
+        return self.expand(Model(name=name, schema=schema))
 
     def parse_array(self, name: str, schema: dict) -> Array:
-        items = self.parse_definition('items', schema['items'])
-        return Array(name=name, items=items, default=schema.get('default', None))
+        return self.expand(Array(name=name, default=schema.get('default', None), schema=schema))
 
     def parse_definition(self, name: str, schema: dict) -> Item:
+        return self.expand(self.create_definition(name=name, schema=schema))
+
+    def parse_enum(self, name: str, schema: dict) -> Optional[Enumeration]:
+        values = schema['enum']
+        typename = type(values[0]) if values else None
+        if typename not in Enumeration.MIXINS or any(type(value) is not typename for value in values):
+            return None
+        values = list(OrderedDict.fromkeys(values))
+        key = json.dumps([typename.__name__, sorted(values)])
+        item = Enumeration(
+            name=name, typename=typename, values=values, default=schema.get('default', None), schema=schema,
+            owner=self.enums.get(key)
+        )
+        item.check_default(name, [item.default] if item.default is not None else [])
+        self.enums.setdefault(key, item)
+        return item
+
+    def name_enums(self) -> None:
+        used_names = {item.class_name() for item in self.items()} | self.used_names
+        for item in self.enums.values():
+            class_type, index_suffix = item.class_type, 1
+            while Item(name=class_type).class_name() in used_names:
+                index_suffix += 1
+                class_type = f'{item.class_type}_{index_suffix}'
+            used_names.add(Item(name=class_type).class_name())
+            item.class_type = class_type
+
+    def create_definition(self, name: str, schema: dict) -> Item:
         default = schema.get('default', None)
 
+        if 'enum' in schema and self.options.generate_enum_classes and schema.get('type') not in ('object', 'array'):
+            enumeration = self.parse_enum(name=name, schema=schema)
+            if enumeration is not None:
+                return enumeration
         if 'type' in schema:
             item_type = schema['type']
             if item_type == 'object' and 'properties' in schema:
-                return self.parse_object(name=name, schema=schema)
+                return Model(name=name, schema=schema)
             elif item_type == 'array':
-                return self.parse_array(name=name, schema=schema)
+                return Array(name=name, default=default, schema=schema)
             else:
-                return Basic(name=name, typename=Basic.TYPE_MAP[item_type], default=default)
+                return Basic(name=name, typename=Basic.TYPE_MAP[item_type], default=default, schema=schema)
         elif 'enum' in schema:
             enum_list = schema['enum']
             assert len(enum_list) > 0, "Enum List is Empty"
             first = enum_list[0]
             assert all(type(first) == type(item) for item in enum_list), "Items in Enum List with Different Types"
             assert type(first) in {int, float, str}, "Enum Type is not int, float or string"
-            return Basic(name=name, typename=type(first), default=default)
+            return Basic(name=name, typename=type(first), default=default, schema=schema)
         elif '$ref' in schema:
-            path: str = schema['$ref']
-            class_type = path.split('/')[-1]
-            return Definition(name=name, class_type=class_type, path=path)
+            return self.parse_reference(name=name, schema=schema)
         else:
             raise ValueError(f'Cannot parse schema {repr(schema)}')
 
     def parse(self, schema: dict):
-        for name, definition in schema.get('definitions', {}).items():
-            item = self.parse_definition(name=name, schema=definition)
-            self.definitions[f'#/definitions/{name}'] = item
+        with self.timed('parse'):
+            self.document_path, self.document = self.schema_path, schema
+            self.used_names.update(Item(name=name).class_name() for name in schema.get('definitions', {}))
+            if 'title' in schema:
+                self.used_names.add(Item(name=schema['title']).class_name())
+            for name, definition in schema.get('definitions', {}).items():
+                item = self.parse_definition(name=name, schema=definition)
+                self.definitions[f'#/definitions/{name}'] = item
+
+            if 'title' in schema or 'definitions' not in schema:
+                name = schema['title']
+                self.root = self.parse_definition(name=name, schema=schema)
+            if self.options.deduplicate_models:
+                self.deduplicated = self.deduplicate()
+            self.hoist_nested()
+            self.name_enums()
+
+    @staticmethod
+    def structure_key(item: Item, keys: Dict[int, str]) -> str:
+        stack = [item]
+        while stack:
+            current = stack[-1]
+            pending = [child for child in current.children() if id(child) not in keys]
+            if pending:
+                stack += pending
+                continue
+            stack.pop()
+            if id(current) not in keys:
+                schema = {k: v for k, v in current.schema.items() if k not in Item.STRUCTURE_IGNORED_KEYS}
+                key = [type(current).__name__, json.dumps(schema, sort_keys=True)]
+                key += [f'{child.name}={keys[id(child)]}' for child in current.children()]
+                keys[id(current)] = hashlib.sha256('\n'.join(key).encode()).hexdigest()
+        return keys[id(item)]
 
-        name = schema['title']
-        self.root = self.parse_definition(name=name, schema=schema)
+    @staticmethod
+    def count_classes(item: Item) -> int:
+        count, stack = 0, [item]
+        while stack:
+            count += 1
+            stack += [child for child in stack.pop().children() if child.is_inner_model()]
+        return count
+
+    def deduplicate(self) -> int:
+        keys: Dict[int, str] = {}
+        shared: Dict[str, tuple] = {}
+        for path, item in self.definitions.items():
+            if type(item) is Model and path.startswith('#/definitions/'):
+                shared.setdefault(self.structure_key(item, keys), (path, item.name))
+
+        counts = Counter()
+        stack = self.items()
+        while stack:
+            for child in stack.pop().children():
+                if type(child) is Model:
+                    key = self.structure_key(child, keys)
+                    counts[key] += 1
+                    if counts[key] > 1:
+                        continue
+                stack.append(child)
+
+        used_names = {item.class_name() for item in self.items()} | self.used_names
+        removed = 0
+        queue = deque(self.items())
+        while queue:
+            parent = queue.popleft()
+            for index, child in enumerate(parent.children()):
+                key = keys.get(id(child)) if type(child) is Model else None
+                if key is None or (key not in shared and counts[key] < 2):
+                    queue.append(child)
+                    continue
+
+                name = child.name
+                if key in shared:
+                    removed += self.count_classes(child)
+                else:
+                    class_type, index_suffix = name, 1
+                    while Item(name=class_type).class_name() in used_names:
+                        index_suffix += 1
+                        class_type = f'{name}_{index_suffix}'
+                    used_names.add(Item(name=class_type).class_name())
+                    child.name = class_type
+                    shared[key] = (f'#/shared/{class_type}', class_type)
+                    self.definitions[shared[key][0]] = child
+                    queue.append(child)
+
+                path, class_type = shared[key]
+                parent.properties[index] = Definition(name=name, class_type=class_type, path=path, schema=child.schema)
+                if isinstance(parent, Array):
+                    parent.items = parent.properties[index]
+        return removed
+
+    def hoist_nested(self) -> None:
+        used_names = {item.class_name() for item in self.items()} | self.used_names
+        queue = deque((item, 0) for item in self.items())
+        while queue:
+            parent, depth = queue.popleft()
+            for index, child in enumerate(parent.children()):
+                if not isinstance(child, Model) or not child.is_inner_model():
+                    continue
+                if depth + 1 < self.MAX_CLASS_DEPTH:
+                    queue.append((child, depth + 1))
+                    continue
+
+                name, class_type, index_suffix = child.name, child.name, 1
+                while Item(name=class_type).class_name() in used_names:
+                    index_suffix += 1
+                    class_type = f'{name}_{index_suffix}'
+                used_names.add(Item(name=class_type).class_name())
+                child.name = class_type
+                path = f'#/nested/{class_type}'
+                self.definitions[path] = child
+                parent.properties[index] = Definition(name=name, class_type=class_type, path=path, schema=child.schema)
+                if isinstance(parent, Array):
+                    parent.items = parent.properties[index]
+                queue.append((child, 0))
 
     def generate(self, schema: dict) -> str:
-        Array.use_list = False
-        result = []
-        for _, definition in self.definitions.items():
-            result.append(definition.to_class_code(level=0))
-            result.append('')
-            result.append('')
-        result.append(self.root.to_class_code(level=0, schema=schema))
+        with self.timed('generate'):
+            return self.generate_module_code(schema)
 
+    def generate_module_code(self, schema: dict) -> str:
+        options = self.options
         headers = []
-        if Array.use_list:
+        if any(item.uses_columns(options) for item in self.items()):
+            headers += ['import array']
+        if self.enums:
+            headers += ['import enum']
+        if options.generate_validate_code or options.generate_to_dict_method or options.generate_stream_methods:
+            headers += ['import json']
+        if any(item.uses_list(options) for item in self.items()):
             headers += ['from typing import List']
-        if Config.generate_validate_code:
-            headers = ['import json'] + headers + ['', 'import jsonschema']
-        if Config.generated_warning:
-            headers = ['"""This file is generated. DO NOT EDIT IT MANUALLY!"""'] + headers
+        third_party = ['import jsonschema'] * options.generate_validate_code
+        third_party += ['import json_schema_to_class'] * options.generate_instrumentation
+        if third_party:
+            headers += ['', *sorted(third_party)]
+        imports = dict(self.imports)
+        shared_validation = self.package and options.generate_inline_validate_code
+        if shared_validation:
+            imports[VALIDATION_MODULE] = {'ValidationError'}
+        if imports:
+            headers += [''] * (len(headers) > 0) + [
+                f'from .{module} import {", ".join(sorted(names))}' for module, names in sorted(imports.items())
+            ]
+        if options.generated_warning:
+            headers = [GENERATED_WARNING] + headers
         if len(headers) > 0:
             headers += ['', '']
-        return Config.line_break.join(headers + result) + Config.line_break
 
+        writer = CodeWriter(options)
+        writer.extend(headers)
+        if options.generate_instrumentation:
+            writer.line('_STATS = json_schema_to_class.construction_stats')
+            writer.line()
+            writer.line()
+        if options.generate_inline_validate_code and not shared_validation:
+            for level, line in VALIDATION_ERROR_CODE:
+                writer.line(line, level)
+            writer.line()
+            writer.line()
+        if any(isinstance(item, Model) and item.uses_frozen_values(options) for item in self.items()):
+            for level, line in FROZEN_VALUE_CODE:
+                writer.line(line, level)
+            writer.line()
+            writer.line()
+        if self.enums:
+            for level, line in ENUM_LOOKUP_CODE:
+                writer.line(line, level)
+            for item in self.enums.values():
+                writer.line()
+                writer.line()
+                item.write_enum_code(writer)
+            writer.line()
+            writer.line()
+        for index, definition in enumerate(self.definitions.values()):
+            if index > 0:
+                writer.line()
+                writer.line()
+            definition.write_class_code(writer)
+        if self.root is not None:
+            if self.definitions:
+                writer.line()
+                writer.line()
+            self.root.write_class_code(writer, schema=schema)
+        return writer.getvalue() + options.line_break
+
+
+def generate_schema_code(schema: dict, options: Options = None) -> str:
+    parser = Parser(options=options)
+    parser.parse(schema=schema)
+    return parser.generate(schema=schema)
 
-def generate_code(schema_path: Path) -> str:
-    with open(str(schema_path), encoding='utf-8') as f:
-        schema = json.load(f)
 
-    parser = Parser()
+def generate_code(schema_path: Path, options: Options = None, store: SchemaStore = None) -> str:
+    parser = Parser(options=options, schema_path=schema_path, store=store)
+    schema = parser.store.load(schema_path)
     parser.parse(schema=schema)
     return parser.generate(schema=schema)
 
 
-def generate_file(schema_path: Path, output_path: Path):
-    lazy_write.write(output_path, generate_code(schema_path))
+class _Token(str):
+    pass
+
+
+def canonical_json(value: Any) -> str:
+    parts, stack = [], [value]
+    while stack:
+        value = stack.pop()
+        if type(value) is _Token:
+            parts.append(value)
+        elif isinstance(value, dict):
+            items = sorted(value.items())
+            stack.append(_Token('}'))
+            for index in range(len(items) - 1, -1, -1):
+                key, child = items[index]
+                stack += [child, _Token(('{' if index == 0 else ',') + json.dumps(key) + ':')]
+            if not items:
+                stack.append(_Token('{'))
+        elif isinstance(value, (list, tuple)):
+            stack.append(_Token(']'))
+            for index in range(len(value) - 1, -1, -1):
+                stack += [value[index], _Token('[' if index == 0 else ',')]
+            if not value:
+                stack.append(_Token('['))
+        else:
+            parts.append(json.dumps(value))
+    return ''.join(parts)
+
+
+class ModuleCache:
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self.modules: 'OrderedDict[str, types.ModuleType]' = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(schema: dict, options: Options, schema_path: Path = None) -> str:
+        location = os.path.abspath(str(schema_path)) if schema_path is not None else None
+        try:
+            content = json.dumps([schema, options.to_dict(), location], sort_keys=True, separators=(',', ':'))
+        except RecursionError:
+            content = canonical_json([schema, options.to_dict(), location])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[types.ModuleType]:
+        with self.lock:
+            module = self.modules.get(key)
+            if module is not None:
+                self.modules.move_to_end(key)
+            return module
+
+    def put(self, key: str, module: types.ModuleType) -> None:
+        with self.lock:
+            self.modules[key] = module
+            self.modules.move_to_end(key)
+            while len(self.modules) > self.max_size:
+                self.modules.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.modules.clear()
+
+
+module_cache = ModuleCache()
+
+
+class ConstructionStats:
+    def __init__(self, sample_rate: float = 1.0, sink: Callable[[type, float], None] = None):
+        self.sample_rate = sample_rate
+        self.sink = sink
+        # per-class itertools.count: next() is atomic, so counting needs no lock
+        self.calls: Dict[str, Iterator[int]] = {}
+        self.reads: Counter = Counter()
+        self.samples: Counter = Counter()
+        self.seconds: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def begin(self) -> Optional[float]:
+        if self.sample_rate >= 1.0 or (self.sample_rate > 0.0 and random.random() < self.sample_rate):
+            return time.perf_counter()
+        return None
+
+    def end(self, key: str, start: Optional[float], cls: type = None) -> None:
+        try:
+            next(self.calls[key])
+        except KeyError:
+            with self.lock:
+                next(self.calls.setdefault(key, itertools.count()))
+        if start is None:
+            return
+        seconds = time.perf_counter() - start
+        with self.lock:
+            self.samples[key] += 1
+            self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+        if self.sink is not None:
+            self.sink(cls, seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            result = {}
+            for name, calls in self.calls.items():
+                # reading a counter advances it, so earlier reads are subtracted
+                count = next(calls) - self.reads[name]
+                self.reads[name] += 1
+                result[name] = {'count': count, 'samples': self.samples[name], 'seconds': self.seconds.get(name, 0.0)}
+            return result
+
+    def reset(self) -> None:
+        with self.lock:
+            self.calls.clear()
+            self.reads.clear()
+            self.samples.clear()
+            self.seconds.clear()
+
+
+construction_stats = ConstructionStats()
+
+
+def compile_schema(
+    schema: dict, options: Options = None, schema_path: Path = None, store: SchemaStore = None
+) -> types.ModuleType:
+    options = options if options is not None else Options()
+    key = ModuleCache.key(schema, options, schema_path)
+    module = module_cache.get(key)
+    if module is None:
+        parser = Parser(options=options, schema_path=schema_path, store=store)
+        parser.parse(schema=schema)
+        code = parser.generate(schema=schema)
+        filename = f'<json-schema-to-class:{key[:16]}>'
+        linecache.cache[filename] = (len(code), None, code.splitlines(keepends=True), filename)
+        module = types.ModuleType(schema.get('title', key[:16]))
+        module.__file__ = filename
+        exec(compile(code, filename, 'exec'), module.__dict__)
+        module_cache.put(key, module)
+    return module
+
+
+def compile_class(schema: dict, options: Options = None, schema_path: Path = None) -> type:
+    module = compile_schema(schema, options=options, schema_path=schema_path)
+    return getattr(module, Item(name=schema['title']).class_name())
+
+
+class SchemaLoader(importlib.abc.Loader):
+    def __init__(self, schema_path: Path, options: Options = None):
+        self.schema_path = schema_path
+        self.options = options if options is not None else Options()
+        self.cache_path = schema_path.parent / '__pycache__' / \
+            f'{schema_path.stem}.{sys.implementation.cache_tag}.jsc'
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        exec(self.get_code(), module.__dict__)
+
+    def read_cache(self) -> Optional[tuple]:
+        try:
+            with open(str(self.cache_path), 'rb') as f:
+                magic, options, mtime, size, digest, dependencies, code = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if magic != importlib.util.MAGIC_NUMBER:
+            return None
+        return options, mtime, size, digest, dependencies, code
+
+    def write_cache(
+        self, options: str, mtime: int, size: int, digest: str, dependencies: list, code: types.CodeType
+    ) -> None:
+        temp_path = self.cache_path.with_name(f'{self.cache_path.name}.{os.getpid()}')
+        try:
+            self.cache_path.parent.mkdir(exist_ok=True)
+            with open(str(temp_path), 'wb') as f:
+                marshal.dump((importlib.util.MAGIC_NUMBER, options, mtime, size, digest, dependencies, code), f)
+            os.replace(str(temp_path), str(self.cache_path))
+        except OSError:
+            pass
+
+    @staticmethod
+    def dependency_state(paths: Iterable[str]) -> list:
+        state = []
+        for path in paths:
+            try:
+                status = os.stat(path)
+                with open(path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                return []
+            state.append((path, status.st_mtime_ns, status.st_size, digest))
+        return state
+
+    @staticmethod
+    def dependencies_unchanged(dependencies: list) -> bool:
+        for path, mtime, size, _ in dependencies:
+            try:
+                status = os.stat(path)
+            except OSError:
+                return False
+            if (status.st_mtime_ns, status.st_size) != (mtime, size):
+                return False
+        return True
+
+    def get_code(self) -> types.CodeType:
+        status = self.schema_path.stat()
+        options = hashlib.sha256((generator_digest() + self.options.digest()).encode()).hexdigest()
+        cache = self.read_cache()
+        if cache is not None and cache[:3] == (options, status.st_mtime_ns, status.st_size) \
+                and self.dependencies_unchanged(cache[4]):
+            return cache[5]
+
+        with open(str(self.schema_path), 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        dependencies = None
+        if cache is not None and cache[0] == options and cache[3] == digest:
+            dependencies = self.dependency_state(path for path, *_ in cache[4])
+            if [entry[3] for entry in dependencies] != [entry[3] for entry in cache[4]]:
+                dependencies = None
+        if dependencies is not None:
+            code = cache[5]
+        else:
+            parser = Parser(options=self.options, schema_path=self.schema_path)
+            schema = json.loads(content)
+            parser.parse(schema=schema)
+            code = compile(parser.generate(schema=schema), str(self.schema_path), 'exec')
+            dependencies = self.dependency_state(sorted(str(path) for path in parser.dependencies))
+        self.write_cache(options, status.st_mtime_ns, status.st_size, digest, dependencies, code)
+        return code
+
+
+class SchemaFinder(importlib.abc.MetaPathFinder):
+    def __init__(self, options: Options = None, packages: Iterable[str] = ()):
+        self.options = options
+        self.packages = set(packages)
+
+    def find_spec(self, fullname: str, path=None, target=None):
+        package, _, name = fullname.rpartition('.')
+        if path is None or package not in self.packages:
+            return None
+        for entry in path:
+            schema_path = Path(entry) / f'{name}.json'
+            if schema_path.is_file():
+                loader = SchemaLoader(schema_path, options=self.options)
+                return importlib.util.spec_from_file_location(fullname, str(schema_path), loader=loader)
+        return None
+
+
+def install_import_hook(options: Options = None, packages: Iterable[str] = ()) -> SchemaFinder:
+    for finder in sys.meta_path:
+        if isinstance(finder, SchemaFinder):
+            finder.packages.update(packages)
+            return finder
+    finder = SchemaFinder(options=options, packages=packages)
+    sys.meta_path.append(finder)
+    return finder
+
+
+def uninstall_import_hook() -> None:
+    sys.meta_path[:] = [finder for finder in sys.meta_path if not isinstance(finder, SchemaFinder)]
+
+
+def generate_file(schema_path: Path, output_path: Path, options: Options = None) -> bool:
+    return lazy_write.write(output_path, generate_code(schema_path, options=options))
+
+
+MANIFEST_NAME = '.json_schema_to_class.json'
+STAMP_NAME = '.stamp'
+
+
+class GenerateReport:
+    def __init__(self):
+        self.generated: List[str] = []
+        self.skipped: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.deduplicated: Dict[str, int] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+
+    def __repr__(self):
+        deduplicated = f', deduplicated: {sum(self.deduplicated.values())}' if self.deduplicated else ''
+        return f'GenerateReport[generated: {len(self.generated)}, skipped: {len(self.skipped)}, ' \
+            f'failed: {len(self.failed)}{deduplicated}]'
+
+
+class GenerateError(Exception):
+    def __init__(self, report: GenerateReport):
+        super().__init__(f'{repr(report)} {report.failed}')
+        self.report = report
+
+
+@lru_cache(maxsize=None)
+def generator_digest() -> str:
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def generator_stamp() -> str:
+    status = os.stat(__file__)
+    return f'{status.st_mtime_ns} {status.st_size} - {os.path.abspath(__file__)}'
+
+
+def schema_digest(schema_path: Path, options: Options) -> str:
+    digest = hashlib.sha256((generator_digest() + options.digest()).encode())
+    with open(str(schema_path), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def dependencies_digest(schema_dir: Path, dependencies: List[str]) -> Optional[str]:
+    digest = hashlib.sha256()
+    for dependency in dependencies:
+        try:
+            with open(str(schema_dir / dependency), 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            return None
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, dict]:
+    try:
+        with open(str(manifest_path), encoding='utf-8') as f:
+            return json.load(f)['files']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def parser_dependencies(parser: Parser) -> List[str]:
+    return sorted(
+        Path(os.path.relpath(str(path), str(parser.schema_path.parent))).as_posix() for path in parser.dependencies
+    )
+
+
+def write_module(parser: Parser, output_path: Path) -> None:
+    schema = parser.store.load(parser.schema_path)
+    parser.parse(schema=schema)
+    lazy_write.write(output_path, parser.generate(schema=schema))
+
+
+def _parser_job(parser: Parser, output_path: Path) -> Tuple[Optional[str], List[str], Dict[str, float], int]:
+    try:
+        write_module(parser, output_path)
+    except Exception as error:
+        return f'{type(error).__name__}: {error}', parser_dependencies(parser), parser.timings, 0
+    return None, parser_dependencies(parser), parser.timings, parser.deduplicated
+
+
+def _generate_job(
+    schema_path: Path, output_path: Path, options: Options, store: SchemaStore = None
+) -> Tuple[Optional[str], List[str], Dict[str, float], int]:
+    return _parser_job(Parser(options=options, schema_path=schema_path, store=store, package=True), output_path)
+
+
+def schema_stamp(name: str, status: Tuple[int, int], digest: str) -> str:
+    return f'{status[0]} {status[1]} {digest} {name}'
+
+
+def record_job(
+    report: GenerateReport, manifest: Dict[str, dict], schema_dir: Path, name: str, digest: str,
+    result: Tuple[Optional[str], List[str], Dict[str, float], int], options: Options
+) -> None:
+    error, dependencies, timings, deduplicated = result
+    report.timings[name] = timings
+    report.dependencies[name] = dependencies
+    if error is None:
+        report.generated.append(name)
+        if options.deduplicate_models:
+            report.deduplicated[name] = deduplicated
+        manifest[name] = {
+            'digest': digest,
+            'dependencies': dependencies,
+            'dependencies_digest': dependencies_digest(schema_dir, dependencies)
+        }
+    else:
+        manifest.pop(name, None)
+        report.failed[name] = error
+
+
+def dependency_stamp(schema_dir: Path, manifest: Dict[str, dict]) -> List[str]:
+    paths = {dependency for entry in manifest.values() for dependency in entry['dependencies']} - set(manifest)
+    stamp = []
+    for path in sorted(paths):
+        status = (schema_dir / path).stat()
+        stamp.append(f'{status.st_mtime_ns} {status.st_size} - {path}')
+    return stamp
+
+
+def write_dir_index(
+    output_dir: Path, manifest: Dict[str, dict], stamp: Optional[List[str]], options: Options
+) -> None:
+    generate_modules = sorted(f'from .{Path(name).stem} import *' for name in manifest)
+    init_content = options.line_break.join(generate_modules) + options.line_break
+    lazy_write.write(output_dir / '__init__.py', init_content)
+
+    validation_path = output_dir / f'{VALIDATION_MODULE}.py'
+    if options.generate_inline_validate_code:
+        writer = CodeWriter(options)
+        if options.generated_warning:
+            writer.extend([GENERATED_WARNING, '', ''])
+        for level, line in VALIDATION_ERROR_CODE:
+            writer.line(line, level)
+        lazy_write.write(validation_path, writer.getvalue() + options.line_break)
+    elif validation_path.exists() and f'{VALIDATION_MODULE}.json' not in manifest:
+        validation_path.unlink()
+
+    manifest_content = json.dumps({'files': manifest}, indent=2, sort_keys=True) + options.line_break
+    lazy_write.write(output_dir / MANIFEST_NAME, manifest_content)
+
+    stamp_path = output_dir / STAMP_NAME
+    if stamp is None:
+        if stamp_path.exists():
+            stamp_path.unlink()
+    else:
+        lazy_write.write(stamp_path, options.line_break.join(stamp) + options.line_break)
+
+
+def finish_dir(
+    schema_dir: Path, output_dir: Path, manifest: Dict[str, dict], stamp: List[str], failed: bool, options: Options
+) -> None:
+    if not failed:
+        stamp = stamp + dependency_stamp(schema_dir, manifest) + [generator_stamp()]
+    write_dir_index(output_dir, manifest, None if failed else stamp, options)
 
 
-def generate_dir(schema_dir: Path, output_dir: Path):
+def generate_dir(
+    schema_dir: Path, output_dir: Path, incremental: bool = False, workers: int = 1, options: Options = None,
+    store: SchemaStore = None
+) -> GenerateReport:
     output_dir.mkdir(exist_ok=True, parents=True)
 
-    generate_modules = []
-    for schema_path in schema_dir.glob('*.json'):
+    options = options if options is not None else Options()
+    manifest_path = output_dir / MANIFEST_NAME
+    last_manifest = load_manifest(manifest_path) if incremental else {}
+    manifest: Dict[str, dict] = {}
+    report = GenerateReport()
+    store = store if store is not None else SchemaStore()
+
+    jobs = []
+    stamp = []
+    for schema_path in sorted(schema_dir.glob('*.json')):
         output_path = output_dir / schema_path.with_suffix('.py').name
-        generate_file(schema_path=schema_path, output_path=output_path)
-        generate_modules.append(f'from .{output_path.stem} import *')
+        status = schema_path.stat()
+        digest = schema_digest(schema_path, options)
+        stamp.append(schema_stamp(schema_path.name, (status.st_mtime_ns, status.st_size), digest))
+        last = last_manifest.get(schema_path.name)
+        if isinstance(last, dict) and last['digest'] == digest and output_path.exists() \
+                and last['dependencies_digest'] == dependencies_digest(schema_dir, last['dependencies']):
+            report.skipped.append(schema_path.name)
+            report.dependencies[schema_path.name] = last['dependencies']
+            manifest[schema_path.name] = last
+        else:
+            jobs.append((schema_path, output_path, digest))
 
-    generate_modules.sort()
-    init_content = Config.line_break.join(generate_modules) + Config.line_break
-    init_path = output_dir / '__init__.py'
-    lazy_write.write(init_path, init_content)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_generate_job, schema_path, output_path, options)
+                       for schema_path, output_path, _ in jobs]
+            results = [future.result() for future in futures]
+    else:
+        results = [_generate_job(schema_path, output_path, options, store) for schema_path, output_path, _ in jobs]
+
+    for (schema_path, _, digest), result in zip(jobs, results):
+        record_job(report, manifest, schema_dir, schema_path.name, digest, result, options)
+
+    finish_dir(schema_dir, output_dir, manifest, stamp, bool(report.failed), options)
+    if report.failed:
+        raise GenerateError(report)
+    return report
+
+
+def read_batch_listing(
+    lines: Iterable[str], base_dir: Path = None, name: str = 'listing'
+) -> Tuple[List[Tuple[Path, Optional[Path]]], Dict[str, str]]:
+    base_dir = base_dir if base_dir is not None else Path()
+    entries = []
+    failed = {}
+    for number, line in enumerate(lines, 1):
+        try:
+            fields = shlex.split(line, comments=True)
+        except ValueError as error:
+            failed[f'{name}:{number}'] = f'ValueError: {error}'
+            continue
+        if not fields:
+            continue
+        if len(fields) > 2:
+            failed[f'{name}:{number}'] = f'ValueError: Cannot parse listing line {repr(line.rstrip())}'
+            continue
+        paths = [base_dir / field for field in fields]
+        entries.append((paths[0], paths[1] if len(paths) > 1 else None))
+    return entries, failed
+
+
+def _generate_batch_job(
+    schema_path: Path, output_path: Path, options: Options, store: SchemaStore = None
+) -> Tuple[Optional[str], bool, Dict[str, float], int]:
+    parser = Parser(options=options, schema_path=schema_path, store=store)
+    try:
+        schema = parser.store.load(schema_path)
+        parser.parse(schema=schema)
+        written = lazy_write.write(output_path, parser.generate(schema=schema), parents=True)
+    except Exception as error:
+        return f'{type(error).__name__}: {error}', False, parser.timings, 0
+    return None, written, parser.timings, parser.deduplicated
+
+
+def generate_batch(
+    jobs: List[Tuple[Path, Path]], workers: int = 1, options: Options = None
+) -> GenerateReport:
+    options = options if options is not None else Options()
+    report = GenerateReport()
+    if workers > 1 and len(jobs) > 1:
+        chunk_size = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                _generate_batch_job, *zip(*jobs), [options] * len(jobs), chunksize=chunk_size
+            ))
+    else:
+        store = SchemaStore()
+        results = [_generate_batch_job(schema_path, output_path, options, store) for schema_path, output_path in jobs]
+
+    for (schema_path, _), (error, written, timings, deduplicated) in zip(jobs, results):
+        name = str(schema_path)
+        report.timings[name] = timings
+        if error is not None:
+            report.failed[name] = error
+            continue
+        if options.deduplicate_models:
+            report.deduplicated[name] = deduplicated
+        if written:
+            report.generated.append(name)
+        else:
+            report.skipped.append(name)
+    if report.failed:
+        raise GenerateError(report)
+    return report
+
+
+class SchemaWatcher:
+    def __init__(
+        self, schema_dir: Path, output_dir: Path, options: Options = None, interval: float = 0.2,
+        debounce: float = 0.1
+    ):
+        self.schema_dir = Path(os.path.abspath(str(schema_dir)))
+        self.output_dir = output_dir
+        self.options = options if options is not None else Options()
+        self.interval = interval
+        self.debounce = debounce
+        self.store = SchemaStore()
+        self.parsers: Dict[str, Parser] = {}
+        self.manifest: Dict[str, dict] = {}
+        self.stamps: Dict[str, str] = {}
+        self.failed: Dict[str, str] = {}
+        self.snapshot: Dict[Path, Tuple[int, int]] = {}
+
+    def watched_paths(self) -> set:
+        paths = set(self.schema_dir.glob('*.json'))
+        for parser in self.parsers.values():
+            paths |= parser.dependencies
+        return paths
+
+    def scan(self, paths: set = None) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.watched_paths() if paths is None else paths:
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (status.st_mtime_ns, status.st_size)
+        return snapshot
+
+    @staticmethod
+    def changed_paths(last: Dict[Path, Tuple[int, int]], snapshot: Dict[Path, Tuple[int, int]]) -> set:
+        return {path for path in set(last) | set(snapshot) if last.get(path) != snapshot.get(path)}
+
+    def affected_names(self, paths: set) -> set:
+        paths = set(paths)
+        while True:
+            dependents = {
+                self.schema_dir / name for name, parser in self.parsers.items() if parser.dependencies & paths
+            }
+            if dependents <= paths:
+                break
+            paths |= dependents
+        return {path.name for path in paths if path.parent == self.schema_dir and path.suffix == '.json'}
+
+    def build(self, names: set = None, snapshot: Dict[Path, Tuple[int, int]] = None) -> GenerateReport:
+        self.output_dir.mkdir(exist_ok=True, parents=True)
+        self.snapshot = snapshot if snapshot is not None else self.scan()
+        if names is None:
+            names = {path.name for path in self.schema_dir.glob('*.json')}
+
+        report = GenerateReport()
+        for name in sorted(names):
+            schema_path = self.schema_dir / name
+            output_path = self.output_dir / schema_path.with_suffix('.py').name
+            if schema_path not in self.snapshot:
+                for mapping in (self.parsers, self.manifest, self.stamps, self.failed):
+                    mapping.pop(name, None)
+                if output_path.exists():
+                    output_path.unlink()
+                continue
+
+            parser = Parser(options=self.options, schema_path=schema_path, store=self.store, package=True)
+            self.parsers[name] = parser
+            digest = schema_digest(schema_path, self.options)
+            result = _parser_job(parser, output_path)
+            record_job(report, self.manifest, self.schema_dir, name, digest, result, self.options)
+            if name in report.failed:
+                self.failed[name] = report.failed[name]
+            else:
+                self.failed.pop(name, None)
+                self.stamps[name] = schema_stamp(name, self.snapshot[schema_path], digest)
+
+        self.snapshot.update(self.scan(self.watched_paths() - set(self.snapshot)))
+        stamp = [self.stamps[name] for name in sorted(self.manifest)]
+        finish_dir(self.schema_dir, self.output_dir, self.manifest, stamp, bool(self.failed), self.options)
+        return report
+
+    def poll(self) -> Optional[GenerateReport]:
+        snapshot = self.scan()
+        changed = self.changed_paths(self.snapshot, snapshot)
+        if not changed:
+            return None
+        while True:
+            time.sleep(self.debounce)
+            settled = self.scan()
+            if settled == snapshot:
+                break
+            changed |= self.changed_paths(snapshot, settled)
+            snapshot = settled
+        for path in changed:
+            self.store.discard(path)
+        return self.build(self.affected_names(changed), snapshot)
+
+    def run(self, stop: threading.Event = None, callback=print) -> None:
+        stop = stop if stop is not None else threading.Event()
+        callback(self.build())
+        while not stop.wait(self.interval):
+            report = self.poll()
+            if report is not None:
+                callback(report)
+
+
+def measure_import(package: str = 'configs', repeat: int = 5, cwd: Path = None) -> float:
+    code = f'import time; start = time.perf_counter(); import {package}; print(time.perf_counter() - start)'
+    return min(
+        float(subprocess.check_output([sys.executable, '-c', code], cwd=None if cwd is None else str(cwd)))
+        for _ in range(repeat)
+    )
 
 
 def main():  # pragma: no cover
     arg_parser = argparse.ArgumentParser(description='JSON Schema to Python Class')
-    arg_parser.add_argument('schema_path', type=str)
+    arg_parser.add_argument(
+        'schema_path', type=str, nargs='*', help='schema files or a schema dir, - reads one schema from stdin'
+    )
     arg_parser.add_argument('-o', '--output-path', type=str, default=None)
+    arg_parser.add_argument(
+        '--batch', type=str, help='file listing schema paths and optional output paths, - for stdin', default=None
+    )
     arg_parser.add_argument('-i', '--indent', type=int, default=4)
+    arg_parser.add_argument('-j', '--jobs', type=int, help='worker processes for a schema dir', default=1)
+    arg_parser.add_argument(
+        '--incremental', action='store_true', help='skip unchanged schemas in a schema dir', default=False
+    )
+    arg_parser.add_argument(
+        '--watch', action='store_true', help='regenerate changed schemas in a schema dir until stopped', default=False
+    )
+    arg_parser.add_argument('--interval', type=float, help='seconds between polls in watch mode', default=0.2)
     arg_parser.add_argument('--repr', action='store_true', help='generate __repr__ method', default=False)
+    arg_parser.add_argument('--slots', action='store_true', help='generate __slots__', default=False)
+    arg_parser.add_argument('--lazy', action='store_true', help='construct nested fields on access', default=False)
+    arg_parser.add_argument(
+        '--dedupe', action='store_true', help='share one class between identical inline objects', default=False
+    )
+    arg_parser.add_argument(
+        '--to-dict', action='store_true', help='generate to_dict and to_json methods', default=False
+    )
+    arg_parser.add_argument(
+        '--stream', action='store_true', help='generate from_records and iter_ndjson constructors', default=False
+    )
+    arg_parser.add_argument(
+        '--columnar', action='store_true', help='store arrays of flat objects as typed columns', default=False
+    )
+    arg_parser.add_argument(
+        '--frozen', action='store_true', help='generate immutable, hashable classes', default=False
+    )
+    arg_parser.add_argument(
+        '--pickle', action='store_true', help='generate compact positional pickle state', default=False
+    )
+    arg_parser.add_argument(
+        '--instrument', action='store_true', help='count and time constructions of generated classes', default=False
+    )
+    arg_parser.add_argument(
+        '--enum', action='store_true', help='generate enum classes for enum schemas', default=False
+    )
     arg_parser.add_argument('--validate', action='store_true', help='validate schema', default=False)
+    arg_parser.add_argument(
+        '--inline-validate', action='store_true', help='validate schema without jsonschema', default=False
+    )
     arg_parser.add_argument(
         '--no-warning', dest="generated_warning", action='store_false', help='add a generated warning', default=True
     )
 
     arguments = arg_parser.parse_args()
-    Config.indent = arguments.indent
-    Config.generate_repr_method = arguments.repr
-    Config.generate_validate_code = arguments.validate
-    Config.generated_warning = arguments.generated_warning
+    options = Options(
+        indent=arguments.indent,
+        generate_repr_method=arguments.repr,
+        generate_slots=arguments.slots,
+        generate_to_dict_method=arguments.to_dict,
+        generate_stream_methods=arguments.stream,
+        generate_columnar_arrays=arguments.columnar,
+        generate_frozen_classes=arguments.frozen,
+        generate_pickle_methods=arguments.pickle,
+        generate_instrumentation=arguments.instrument,
+        generate_enum_classes=arguments.enum,
+        generate_lazy_properties=arguments.lazy,
+        generate_validate_code=arguments.validate,
+        generate_inline_validate_code=arguments.inline_validate,
+        generated_warning=arguments.generated_warning,
+        deduplicate_models=arguments.dedupe
+    )
 
-    if arguments.output_path is None:
-        print(generate_code(arguments.schema_path))
+    if arguments.batch is not None or len(arguments.schema_path) > 1:
+        if '-' in arguments.schema_path:
+            arg_parser.error('a schema from stdin cannot be combined with other schemas')
+        if arguments.incremental or arguments.watch:
+            arg_parser.error('--incremental and --watch need a single schema dir, not a batch')
+        entries = [(Path(schema_path), None) for schema_path in arguments.schema_path]
+        listing_failed = {}
+        if arguments.batch == '-':
+            listing, listing_failed = read_batch_listing(sys.stdin, name='<stdin>')
+            entries += listing
+        elif arguments.batch is not None:
+            try:
+                with open(arguments.batch, encoding='utf-8') as f:
+                    listing, listing_failed = read_batch_listing(
+                        f, base_dir=Path(arguments.batch).parent, name=arguments.batch
+                    )
+            except OSError as error:
+                arg_parser.error(f'cannot read listing: {error}')
+            entries += listing
+        output_dir = Path(arguments.output_path) if arguments.output_path is not None else None
+        jobs = [
+            (schema_path, output_path or (output_dir or schema_path.parent) / schema_path.with_suffix('.py').name)
+            for schema_path, output_path in entries
+        ]
+        try:
+            report = generate_batch(jobs, workers=arguments.jobs, options=options)
+        except GenerateError as error:
+            report = error.report
+        report.failed.update(listing_failed)
+        print(report)
+        for name, message in report.failed.items():
+            print(f'{name}: {message}', file=sys.stderr)
+        if report.failed:
+            sys.exit(1)
+        return
+
+    if len(arguments.schema_path) == 0:
+        arg_parser.error('a schema path or --batch is required')
+    schema_path = arguments.schema_path[0]
+    if arguments.watch and not Path(schema_path).is_dir():
+        arg_parser.error('watch mode needs a schema dir')
+    if Path(schema_path).is_dir():
+        if arguments.output_path is None:
+            arg_parser.error('output path is required for a schema dir')
+        if arguments.watch:
+            watcher = SchemaWatcher(
+                schema_dir=Path(schema_path),
+                output_dir=Path(arguments.output_path),
+                options=options,
+                interval=arguments.interval
+            )
+            try:
+                watcher.run(callback=lambda report: print(GenerateError(report) if report.failed else report))
+            except KeyboardInterrupt:
+                pass
+            return
+        report = generate_dir(
+            schema_dir=Path(schema_path),
+            output_dir=Path(arguments.output_path),
+            incremental=arguments.incremental,
+            workers=arguments.jobs,
+            options=options
+        )
+        print(report)
     else:
-        generate_file(Path(arguments.schema_path), Path(arguments.output_path))
+        if schema_path == '-':
+            parser, schema = Parser(options=options), json.load(sys.stdin)
+        else:
+            parser = Parser(options=options, schema_path=Path(schema_path))
+            schema = parser.store.load(parser.schema_path)
+        parser.parse(schema=schema)
+        code = parser.generate(schema=schema)
+        if arguments.output_path in (None, '-'):
+            print(code)
+        else:
+            lazy_write.write(Path(arguments.output_path), code)
+        if options.deduplicate_models:
+            print(f'deduplicated: {parser.deduplicated}', file=sys.stderr)
+
+
+INIT_CODE_LINES = (
+    "import os",
+    "",
+    "current_dir = os.path.dirname(os.path.abspath(__file__))",
+    "schema_dir = os.path.join(os.path.dirname(current_dir), 'schema')",
+    "build_dir = os.path.join(current_dir, 'build')",
+    "",
+    "",
+    "def is_up_to_date():",
+    "    try:",
+    "        with open(os.path.join(build_dir, '.stamp')) as f:",
+    "            stamp = [line.split(' ', 3) for line in f.read().splitlines()]",
+    "        names = sorted(name for name in os.listdir(schema_dir) if name.endswith('.json'))",
+    "        if [entry[-1] for entry in stamp if entry[2] != '-'] != names:",
+    "            return False",
+    "        for mtime, size, _, name in stamp:",
+    "            status = os.stat(os.path.join(schema_dir, name))",
+    "            if (status.st_mtime_ns, status.st_size) != (int(mtime), int(size)):",
+    "                return False",
+    "    except (OSError, ValueError):",
+    "        return False",
+    "    return True",
+    "",
+    "",
+    "if __name__ == '__main__' or not is_up_to_date():",
+    "    from pathlib import Path",
+    "",
+    "    import json_schema_to_class",
+    "",
+    "    json_schema_to_class.generate_dir(",
+    "        schema_dir=Path(schema_dir),",
+    "        output_dir=Path(build_dir),",
+    "        incremental=True",
+    "    )",
+    "",
+    "    del json_schema_to_class",
+    "    del Path",
+    "",
+    "if __name__ != '__main__':",
+    "    from .build import *  # noqa: F403",
+    "",
+    "del os",
+    "del current_dir",
+    "del schema_dir",
+    "del build_dir",
+    "del is_up_to_date",
+)
 
 
 def cli():  # pragma: no cover
-    init_code_lines = (
-        "from pathlib import Path",
-        "",
-        "import json_schema_to_class",
-        "",
-        "current_dir: Path = Path(__file__).parent",
-        "json_schema_to_class.generate_dir(",
-        "    schema_dir=current_dir.parent / 'schema',",
-        "    output_dir=current_dir / 'build'",
-        ")",
-        "",
-        "if __name__ != '__main__':",
-        "    from .build import *  # noqa: F403",
-        "",
-        "    del json_schema_to_class",
-        "    del current_dir",
-        "    del Path",
-    )
-
     arg_parser = argparse.ArgumentParser(description='JSON Schema to Python Class')
-    arg_parser.add_argument('command', type=str, choices=['init', 'compile', 'print'])
+    arg_parser.add_argument('command', type=str, choices=['init', 'compile', 'print', 'time'])
 
     arguments = arg_parser.parse_args()
     command: str = arguments.command
     if command == 'print':
-        print(Config.line_break.join(init_code_lines))
+        print(Config.line_break.join(INIT_CODE_LINES))
     elif command == 'init':
         configs_dir = Path('./configs')
         configs_dir.mkdir(parents=True, exist_ok=True)
         init_path = configs_dir / '__init__.py'
-        init_content = Config.line_break.join(init_code_lines) + Config.line_break
+        init_content = Config.line_break.join(INIT_CODE_LINES) + Config.line_break
         lazy_write.write(init_path, init_content)
     elif command == 'compile':
         print(r'Please run [find . -path "*/configs/__init__.py" -exec python3 {} \;]')
+    elif command == 'time':
+        print(f'import configs: {measure_import() * 1000:.2f} ms')
 
 
 if __name__ == '__main__':
@@ -1,7 +1,21 @@
+import enum
+import gc
+import importlib
 import importlib.util
+import io
 import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
 import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest import mock
 
 import json_schema_to_class
 
@@ -24,9 +38,17 @@ class MyTestCase(unittest.TestCase):
         with open(str(self.schema_path)) as f:
             self.test_schema = json.load(f)
 
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+        self.config = json_schema_to_class.Config.snapshot()
         json_schema_to_class.Config.generate_repr_method = False
         json_schema_to_class.Config.generate_validate_code = False
 
+    def tearDown(self):
+        json_schema_to_class.Config.restore(self.config)
+        self.temp_dir.cleanup()
+
     def test_basic(self):
         parser = json_schema_to_class.Parser()
         parser.parse(schema={
@@ -129,6 +151,249 @@ class MyTestCase(unittest.TestCase):
             output_dir=self.output_path.parent
         )
 
+    def test_generate_dir_incremental(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            schema_dir = Path(temp_dir) / 'schema'
+            output_dir = Path(temp_dir) / 'build'
+            shutil.copytree(str(self.schema_path.parent), str(schema_dir), ignore=shutil.ignore_patterns('build'))
+
+            report = json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True, workers=2)
+            self.assertEqual((len(report.generated), len(report.skipped), len(report.failed)), (4, 0, 0))
+            init_content = (output_dir / '__init__.py').read_text()
+
+            report = json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True)
+            self.assertEqual((len(report.generated), len(report.skipped)), (0, 4))
+            stamp = (output_dir / json_schema_to_class.STAMP_NAME).read_text()
+            self.assertIn(os.path.abspath(json_schema_to_class.__file__), stamp)
+
+            with mock.patch.object(json_schema_to_class, 'generator_digest', return_value='upgraded'):
+                report = json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True)
+            self.assertEqual((len(report.generated), len(report.skipped)), (4, 0))
+
+            json_schema_to_class.Config.generate_repr_method = True
+            (schema_dir / 'broken.json').write_text('{"title": "broken", "type": "array", "items": {}}')
+            with self.assertRaises(json_schema_to_class.GenerateError) as context:
+                json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True, workers=2)
+            report = context.exception.report
+            self.assertEqual((len(report.generated), len(report.skipped), len(report.failed)), (4, 0, 1))
+            self.assertIn('broken.json', report.failed)
+            self.assertEqual((output_dir / '__init__.py').read_text(), init_content)
+
+    def test_generate_batch(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            (temp_dir / 'broken.json').write_text('{"title": "broken", "type": "array", "items": {}}')
+            listing = ['# schemas', f'"{self.schema_path}" out/first.py', '', str(self.schema_path_2), 'broken.json']
+            entries, failed = json_schema_to_class.read_batch_listing(listing, base_dir=temp_dir)
+            self.assertEqual(failed, {})
+            self.assertEqual(entries, [
+                (self.schema_path, temp_dir / 'out' / 'first.py'),
+                (self.schema_path_2, None),
+                (temp_dir / 'broken.json', None),
+            ])
+            malformed, failed = json_schema_to_class.read_batch_listing(['a.json b.py c.py', '"open', 'b.json'])
+            self.assertEqual(malformed, [(Path('b.json'), None)])
+            self.assertEqual(sorted(failed), ['listing:1', 'listing:2'])
+
+            jobs = [(schema_path, output_path or temp_dir / schema_path.with_suffix('.py').name)
+                    for schema_path, output_path in entries]
+            with self.assertRaises(json_schema_to_class.GenerateError) as context:
+                json_schema_to_class.generate_batch(jobs, workers=2)
+            report = context.exception.report
+            self.assertEqual(report.generated, [str(self.schema_path), str(self.schema_path_2)])
+            self.assertIn('Cannot parse schema', report.failed[str(temp_dir / 'broken.json')])
+            self.assertEqual(
+                (temp_dir / 'out' / 'first.py').read_text(), json_schema_to_class.generate_code(self.schema_path)
+            )
+
+            report = json_schema_to_class.generate_batch(jobs[:2])
+            self.assertEqual(report.skipped, [str(self.schema_path), str(self.schema_path_2)])
+            self.assertEqual(sorted(report.timings[str(self.schema_path)]), ['generate', 'parse'])
+
+        output = subprocess.run(
+            [sys.executable, json_schema_to_class.__file__, '-', '--slots'], check=True, stdout=subprocess.PIPE,
+            input=self.schema_path.read_bytes()
+        ).stdout.decode()
+        self.assertIn('__slots__', output)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            listing = f'{self.schema_path} a.py extra\n{self.schema_path}\n'
+            result = subprocess.run(
+                [sys.executable, json_schema_to_class.__file__, '--batch', '-', '-o', temp_dir],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, input=listing.encode()
+            )
+            self.assertEqual(result.returncode, 1)
+            self.assertIn(b'<stdin>:1: ValueError', result.stderr)
+            self.assertTrue((Path(temp_dir) / 'test_schema.py').exists())
+
+    def test_multi_file_refs(self):
+        address = {'type': 'object', 'properties': {'city': {'type': 'string', 'default': 'Paris'}}}
+        common = {'definitions': {'address': address}}
+        tags = {'title': 'tags', 'type': 'object', 'properties': {'tag': {'type': 'string', 'default': 'x'}}}
+        person = {
+            'title': 'person',
+            'type': 'object',
+            'properties': {
+                'home': {'$ref': 'common.json#/definitions/address'},
+                'tags': {'$ref': 'tags.json#'},
+                'label': {'$ref': 'tags.json#/properties/tag'},
+                'work': {'$ref': '#/properties/home'}
+            }
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            schema_dir = Path(temp_dir) / 'schema'
+            output_dir = Path(temp_dir) / 'multi_file_build'
+            schema_dir.mkdir()
+            for name, schema in [('common', common), ('tags', tags), ('person', person)]:
+                (schema_dir / f'{name}.json').write_text(json.dumps(schema))
+
+            code = json_schema_to_class.generate_code(schema_dir / 'person.json')
+            self.assertIn('class Address:', code)
+            self.assertNotIn('import', code.split('class')[0])
+
+            report = json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True)
+            self.assertEqual(len(report.generated), 3)
+            person_code = (output_dir / 'person.py').read_text()
+            self.assertIn('from .common import Address', person_code)
+            self.assertIn('from .tags import Tags', person_code)
+            self.assertNotIn('class Address', person_code)
+
+            sys.path.insert(0, temp_dir)
+            try:
+                module = importlib.import_module('multi_file_build.person')
+                obj = module.Person({'home': {'city': 'Oslo'}, 'tags': {}})
+                self.assertIs(type(obj.home), importlib.import_module('multi_file_build.common').Address)
+                self.assertEqual((obj.home.city, obj.work.city, obj.tags.tag, obj.label), ('Oslo', 'Paris', 'x', 'x'))
+            finally:
+                sys.path.remove(temp_dir)
+                for name in [name for name in sys.modules if name.startswith('multi_file_build')]:
+                    del sys.modules[name]
+
+            report = json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True)
+            self.assertEqual(len(report.skipped), 3)
+            tags['properties']['tag']['default'] = 'y'
+            (schema_dir / 'tags.json').write_text(json.dumps(tags))
+            report = json_schema_to_class.generate_dir(schema_dir, output_dir, incremental=True)
+            self.assertEqual(sorted(report.generated), ['person.json', 'tags.json'])
+
+    def test_multi_file_same_name(self):
+        def item(name):
+            properties = {name: {'type': 'integer', 'default': 1}}
+            return {'definitions': {'item': {'type': 'object', 'properties': properties}}}
+
+        main = {
+            'title': 'p',
+            'type': 'object',
+            'definitions': {'item': {'type': 'object', 'properties': {'z': {'type': 'integer', 'default': 3}}}},
+            'properties': {
+                'a': {'$ref': 'a.json#/definitions/item'},
+                'b': {'$ref': 'b.json#/definitions/item'},
+                'c': {'$ref': '#/definitions/item'}
+            }
+        }
+        schema_dir = self.temp_path / 'schema'
+        schema_dir.mkdir()
+        for name, schema in [('a', item('x')), ('b', item('y')), ('p', main)]:
+            (schema_dir / f'{name}.json').write_text(json.dumps(schema))
+
+        namespace = {}
+        exec(json_schema_to_class.generate_code(schema_dir / 'p.json'), namespace)
+        obj = namespace['P']()
+        self.assertEqual((obj.a.x, obj.b.y, obj.c.z), (1, 1, 3))
+        self.assertEqual(len({type(obj.a), type(obj.b), type(obj.c)}), 3)
+
+        output_dir = self.temp_path / 'same_name_build'
+        json_schema_to_class.generate_dir(schema_dir, output_dir)
+        code = (output_dir / 'p.py').read_text()
+        self.assertIn('from .a import Item as Item2', code)
+        self.assertIn('from .b import Item as Item3', code)
+        sys.path.insert(0, str(self.temp_path))
+        try:
+            obj = importlib.import_module('same_name_build.p').P()
+            self.assertEqual((obj.a.x, obj.b.y, obj.c.z), (1, 1, 3))
+            self.assertIs(type(obj.b), importlib.import_module('same_name_build.b').Item)
+        finally:
+            sys.path.remove(str(self.temp_path))
+            for name in [name for name in sys.modules if name.startswith('same_name_build')]:
+                del sys.modules[name]
+
+    def test_watch_dir(self):
+        tags = {'title': 'tags', 'type': 'object', 'properties': {'tag': {'type': 'string', 'default': 'x'}}}
+        person = {'title': 'person', 'type': 'object', 'properties': {'tags': {'$ref': 'tags.json#'}}}
+        other = {'title': 'other', 'type': 'object', 'properties': {'size': {'type': 'integer', 'default': 1}}}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            schema_dir = Path(temp_dir) / 'schema'
+            output_dir = Path(temp_dir) / 'build'
+            schema_dir.mkdir()
+            for name, schema in [('tags', tags), ('person', person), ('other', other)]:
+                (schema_dir / f'{name}.json').write_text(json.dumps(schema))
+
+            watcher = json_schema_to_class.SchemaWatcher(schema_dir, output_dir, debounce=0)
+            report = watcher.build()
+            self.assertEqual(sorted(report.generated), ['other.json', 'person.json', 'tags.json'])
+            self.assertTrue((output_dir / json_schema_to_class.STAMP_NAME).exists())
+            self.assertIsNone(watcher.poll())
+
+            tags['properties']['tag']['default'] = 'yy'
+            (schema_dir / 'tags.json').write_text(json.dumps(tags))
+            report = watcher.poll()
+            self.assertEqual(sorted(report.generated), ['person.json', 'tags.json'])
+            self.assertEqual(sorted(report.timings), ['person.json', 'tags.json'])
+            self.assertIn("'yy'", (output_dir / 'tags.py').read_text())
+
+            (schema_dir / 'other.json').write_text('{"title": "other", "type": "array", "items": {}}')
+            report = watcher.poll()
+            self.assertEqual(list(report.failed), ['other.json'])
+            self.assertFalse((output_dir / json_schema_to_class.STAMP_NAME).exists())
+
+            (schema_dir / 'other.json').unlink()
+            report = watcher.poll()
+            self.assertEqual(report.generated, [])
+            self.assertFalse((output_dir / 'other.py').exists())
+            self.assertNotIn('other', (output_dir / '__init__.py').read_text())
+            self.assertTrue((output_dir / json_schema_to_class.STAMP_NAME).exists())
+
+            person['properties']['home'] = {'$ref': '../shared/home.json#'}
+            (schema_dir / 'person.json').write_text(json.dumps(person))
+            self.assertEqual(list(watcher.poll().failed), ['person.json'])
+            (Path(temp_dir) / 'shared').mkdir()
+            (Path(temp_dir) / 'shared' / 'home.json').write_text(json.dumps(other))
+            report = watcher.poll()
+            self.assertEqual((report.generated, report.failed), (['person.json'], {}))
+            self.assertIn('self.home = Other(', (output_dir / 'person.py').read_text())
+
+    def test_init_code_fast_path(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            schema_dir = Path(temp_dir) / 'schema'
+            schema_dir.mkdir()
+            shutil.copy(str(self.schema_path), str(schema_dir / self.schema_path.name))
+            shared_dir = Path(temp_dir) / 'shared'
+            shared_dir.mkdir()
+            address = {'type': 'object', 'properties': {'city': {'type': 'string', 'default': 'Paris'}}}
+            (shared_dir / 'common.json').write_text(json.dumps({'definitions': {'address': address}}))
+            (schema_dir / 'person.json').write_text(json.dumps({'title': 'person', 'type': 'object', 'properties': {
+                'home': {'$ref': '../shared/common.json#/definitions/address'}
+            }}))
+            configs_dir = Path(temp_dir) / 'configs'
+            configs_dir.mkdir()
+            (configs_dir / '__init__.py').write_text('\n'.join(json_schema_to_class.INIT_CODE_LINES) + '\n')
+
+            code = 'import sys, configs; print(configs.LrSchedulerConfigs, "json_schema_to_class" in sys.modules)'
+            env = dict(os.environ, PYTHONPATH=str(Path(json_schema_to_class.__file__).parent))
+            cold = subprocess.check_output([sys.executable, '-c', code], cwd=temp_dir, env=env).decode()
+            self.assertTrue(cold.strip().endswith('True'))
+            self.assertTrue((configs_dir / 'build' / json_schema_to_class.STAMP_NAME).exists())
+
+            warm = subprocess.check_output([sys.executable, '-c', code], cwd=temp_dir, env=env).decode()
+            self.assertTrue(warm.strip().endswith('False'))
+
+            address['properties']['city']['default'] = 'Rome'
+            (shared_dir / 'common.json').write_text(json.dumps({'definitions': {'address': address}}))
+            code = 'import sys, configs; print(configs.Person().home.city, "json_schema_to_class" in sys.modules)'
+            changed = subprocess.check_output([sys.executable, '-c', code], cwd=temp_dir, env=env).decode()
+            self.assertEqual(changed.split(), ['Rome', 'True'])
+            self.assertGreater(json_schema_to_class.measure_import(repeat=1, cwd=Path(temp_dir)), 0)
+
     def test_generate_dir_with_repr(self):
         json_schema_to_class.Config.generate_repr_method = True
         json_schema_to_class.generate_dir(
@@ -150,6 +415,8 @@ class MyTestCase(unittest.TestCase):
 
         cls = getattr(module, 'LrSchedulerConfigs')
         self.assertIsNotNone(cls)
+        self.assertTrue(cls.VALIDATOR.is_valid([]))
+        self.assertFalse(hasattr(getattr(module, 'LrSchedulerConfig'), 'VALIDATOR'))
 
         cls([])
         cls([{}])
@@ -170,12 +437,603 @@ class MyTestCase(unittest.TestCase):
         ]
         cls(values)
 
+        jsonschema = __import__('jsonschema')
         values[0]['base_lr'] = '0.1'  # except validate error
-        with self.assertRaises(Exception):
+        with self.assertRaises(jsonschema.ValidationError):
             cls(values)
+        with self.assertRaises(jsonschema.ValidationError):
+            cls([{'warm_up': {'steps': 'many'}}])
 
         json_schema_to_class.generate_file(self.schema_path_2, self.validate_path)
 
+        schema = {'title': 'broken', 'type': 'object', 'properties': {'size': {'type': 'integer', 'minimum': 'zero'}}}
+        options = json_schema_to_class.Options(generate_validate_code=True)
+        self.assertRaises(jsonschema.SchemaError, json_schema_to_class.compile_schema, schema, options)
+
+    def test_generate_inline_validate(self):
+        json_schema_to_class.Config.generate_inline_validate_code = True
+        json_schema_to_class.generate_file(self.schema_path, self.validate_path)
+        module = absolute_import(name='inline_validate', module_path=self.validate_path)
+        self.assertNotIn('jsonschema', self.validate_path.read_text())
+
+        cls = getattr(module, 'LrSchedulerConfigs')
+        cls([{}, {'milestones': [0.5], 'warm_up': {'steps': 1}}])
+
+        for values, path in (
+            ({}, '$'),
+            ([{'base_lr': '0.1'}], '$[0].base_lr'),
+            ([{}, {'lr_mode': 'linear'}], '$[1].lr_mode'),
+            ([{'milestones': [0.5, None]}], '$[0].milestones[1]'),
+            ([{'warm_up': {'steps': 1.5}}], '$[0].warm_up.steps'),
+            ([{'unknown': 1}], '$[0]'),
+        ):
+            with self.assertRaises(module.ValidationError) as context:
+                cls(values)
+            self.assertEqual(context.exception.path, path)
+
+        parser = json_schema_to_class.Parser()
+        schema = {
+            'title': 'bounds',
+            'type': 'object',
+            'required': ['name'],
+            'properties': {
+                'name': {'type': 'string', 'minLength': 1, 'maxLength': 3},
+                'ratio': {'type': 'number', 'minimum': 0, 'exclusiveMaximum': 1},
+                'tags': {'type': 'array', 'items': {'type': 'string'}, 'maxItems': 1}
+            }
+        }
+        parser.parse(schema)
+        namespace = {}
+        exec(parser.generate(schema), namespace)
+        cls = namespace['Bounds']
+        cls({'name': 'abc', 'ratio': 0, 'tags': []})
+        for values in ({}, {'name': ''}, {'name': 'abcd'}, {'name': 'a', 'ratio': 1}, {'name': 'a', 'tags': [1]}):
+            self.assertRaises(namespace['ValidationError'], cls, values)
+
+        schema = {
+            'title': 'choices',
+            'type': 'object',
+            'properties': {
+                'level': {'enum': [1, 2, 3]},
+                'flag': {'type': 'boolean', 'enum': [True]},
+                'ratio': {'enum': [0.5, 1.0]},
+                'count': {'type': 'integer'}
+            }
+        }
+        namespace = {}
+        exec(json_schema_to_class.generate_schema_code(schema), namespace)
+        validator = __import__('jsonschema').validators.validator_for(schema)(schema)
+        for name, value in (
+            ('level', 1), ('level', 1.0), ('level', True), ('level', '1'), ('flag', True), ('flag', 1),
+            ('flag', 1.0), ('ratio', 1), ('ratio', False), ('ratio', 0.5), ('count', 1.0), ('count', 1.5),
+            ('count', True), ('count', 2)
+        ):
+            values = {name: value}
+            if validator.is_valid(values):
+                namespace['Choices'](values)
+            else:
+                self.assertRaises(namespace['ValidationError'], namespace['Choices'], values)
+
+    def test_inline_validate_package(self):
+        options = json_schema_to_class.Options(generate_inline_validate_code=True)
+        output_dir = self.temp_path / 'validate_build'
+        json_schema_to_class.generate_dir(self.schema_path.parent, output_dir, options=options)
+        self.assertNotIn('class ValidationError', (output_dir / 'test_schema.py').read_text())
+        sys.path.insert(0, str(self.temp_path))
+        try:
+            package = importlib.import_module('validate_build')
+            self.assertIs(package.test_schema.ValidationError, package.test_schema_2.ValidationError)
+            with self.assertRaises(package.ValidationError):
+                package.LrSchedulerConfigs([{'base_lr': '0.1'}])
+        finally:
+            sys.path.remove(str(self.temp_path))
+            for name in [name for name in sys.modules if name.startswith('validate_build')]:
+                del sys.modules[name]
+
+        json_schema_to_class.generate_dir(self.schema_path.parent, output_dir)
+        self.assertFalse((output_dir / '_validation.py').exists())
+
+    def test_generate_slots(self):
+        json_schema_to_class.Config.generate_slots = True
+        json_schema_to_class.Config.generate_repr_method = True
+        json_schema_to_class.generate_file(self.schema_path_2, self.temp_path / 'test_slots.py')
+        module = absolute_import(name='slots', module_path=self.temp_path / 'test_slots.py')
+
+        obj = module.OptimizerWrapperConfig({'rules': [{'kwargs': {'lr': 0.1}}]})
+        self.assertFalse(hasattr(obj, '__dict__'))
+        self.assertFalse(hasattr(obj.rules, '__dict__'))
+        self.assertFalse(hasattr(obj.rules[0].kwargs, '__dict__'))
+        self.assertEqual(obj.rules[0].kwargs.lr, 0.1)
+        self.assertIn('lr: 0.1', repr(obj.rules[0]))
+        with self.assertRaises(AttributeError):
+            obj.unknown = 1
+
+    def test_generate_to_dict(self):
+        json_schema_to_class.Config.generate_to_dict_method = True
+        output_path = self.temp_path / 'test_to_dict.py'
+        json_schema_to_class.generate_file(self.schema_path_2, output_path)
+        module = absolute_import(name='to_dict', module_path=output_path)
+
+        obj = module.OptimizerWrapperConfig({'momentum': 0.9, 'rules': [{'prefix_list': ['a'], 'kwargs': {'lr': 1}}]})
+        values = obj.to_dict()
+        self.assertEqual(values['momentum'], 0.9)
+        self.assertIs(type(values['rules']), list)
+        self.assertEqual(values['rules'][0]['prefix_list'], ['a'])
+        self.assertEqual(values['rules'][0]['kwargs'], {'lr': 1})
+        self.assertEqual(module.OptimizerWrapperConfig(json.loads(obj.to_json())).to_dict(), values)
+
+        json_schema_to_class.generate_file(self.schema_path, output_path)
+        module = absolute_import(name='to_dict', module_path=output_path)
+        values = module.LrSchedulerConfigs([{'warm_up': {'steps': 2}}]).to_dict()
+        self.assertEqual(values[0]['warm_up'], {'start': 0.0, 'steps': 2})
+
+    def test_generate_stream(self):
+        json_schema_to_class.Config.generate_stream_methods = True
+        output_path = self.temp_path / 'test_stream.py'
+        json_schema_to_class.generate_file(self.schema_path, output_path)
+        module = absolute_import(name='stream', module_path=output_path)
+
+        lines = ['{"warm_up": {"steps": 1}}', '', '{"base_lr": 0.5}']
+        records = module.LrSchedulerConfigs.iter_ndjson(io.StringIO('\n'.join(lines)))
+        self.assertIsInstance(next(records), module.LrSchedulerConfig)
+        self.assertEqual(next(records).base_lr, 0.5)
+        self.assertEqual(list(records), [])
+
+        steps = [warm_up.steps for warm_up in module.WarmUp.from_records(iter([{'steps': 2}, {}]))]
+        self.assertEqual(steps, [2, 0])
+
+    def test_generate_columnar(self):
+        item = {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer', 'default': 0},
+                'ratio': {'type': 'number', 'default': 0.5},
+                'active': {'type': 'boolean', 'default': False},
+                'label': {'type': 'string', 'default': 'x'},
+                'size': {'type': 'integer'}
+            }
+        }
+        schema = {'title': 'table', 'type': 'object', 'properties': {'rows': {'type': 'array', 'items': item}}}
+        options = json_schema_to_class.Options(generate_columnar_arrays=True, generate_to_dict_method=True)
+        module = json_schema_to_class.compile_schema(schema, options=options)
+
+        rows = module.Table({'rows': [{'count': 3, 'active': True, 'size': 1}, {'label': 'y'}]}).rows
+        self.assertEqual(len(rows), 2)
+        self.assertEqual((rows.count.typecode, rows.ratio.typecode, rows.active.typecode), ('q', 'd', 'B'))
+        self.assertEqual(list(rows.count), [3, 0])
+        self.assertEqual((rows.label, rows.size), (['x', 'y'], [1, None]))
+        self.assertIs(rows[0].active, True)
+        self.assertEqual(rows[-1].label, 'y')
+        self.assertEqual([row.count for row in rows[::-1]], [0, 3])
+        self.assertRaises(IndexError, rows.__getitem__, 2)
+
+        rows[1].count = 5
+        self.assertEqual(list(rows.count), [3, 5])
+        self.assertEqual(rows.to_dict()[1], {'count': 5, 'ratio': 0.5, 'active': False, 'label': 'y', 'size': None})
+
+        rows[0].active = None
+        rows[1].count = 2 ** 63
+        self.assertEqual((rows.count, rows.active), ([3, 2 ** 63], [None, False]))
+        self.assertIs(rows[1].active, False)
+        records = [{'count': None, 'ratio': 2 ** 1024, 'active': None}, {'count': 1.5}, {'count': -2 ** 70}]
+        rows = module.Table({'rows': records}).rows
+        self.assertEqual((rows.count, rows.ratio, rows.active), ([None, 1.5, -2 ** 70], [2 ** 1024, 0.5, 0.5], [
+            None, False, False
+        ]))
+        self.assertEqual([row.active for row in rows], [None, False, False])
+
+        item['properties']['nested'] = {'type': 'object', 'properties': {}}
+        module = json_schema_to_class.compile_schema(schema, options=options)
+        self.assertIsInstance(module.Table({'rows': [{}]}).rows, list)
+
+    def test_generate_frozen(self):
+        json_schema_to_class.Config.generate_frozen_classes = True
+        json_schema_to_class.Config.generate_slots = True
+        json_schema_to_class.Config.generate_lazy_properties = True
+        output_path = self.temp_path / 'test_frozen.py'
+        json_schema_to_class.generate_file(self.schema_path_2, output_path)
+        module = absolute_import(name='frozen', module_path=output_path)
+
+        values = {'momentum': 0.9, 'rules': [{'prefix_list': ['a'], 'kwargs': {'lr': 0.1}}]}
+        obj = module.OptimizerWrapperConfig(values)
+        self.assertIsInstance(obj.rules, tuple)
+        self.assertEqual(obj.rules[0].prefix_list, ('a',))
+        self.assertEqual(obj, module.OptimizerWrapperConfig(values))
+        self.assertEqual({obj: 1}[module.OptimizerWrapperConfig(values)], 1)
+        self.assertNotEqual(obj, module.OptimizerWrapperConfig())
+        with self.assertRaises(AttributeError):
+            obj.momentum = 0.5
+        with self.assertRaises(AttributeError):
+            obj.rules[0].kwargs.lr = 0.5
+
+        changed = obj.replace(momentum=0.5)
+        self.assertIs(changed.rules, obj.rules)
+        self.assertEqual((changed.momentum, obj.momentum), (0.5, 0.9))
+        self.assertNotEqual(hash(changed), hash(obj))
+        self.assertEqual(changed.replace(momentum=0.9), obj)
+        self.assertRaises(TypeError, obj.replace, unknown=1)
+
+        rule = obj.rules[0].replace(prefix_list=['b', 'c'], kwargs={'lr': 0.2})
+        self.assertEqual(rule.prefix_list, ('b', 'c'))
+        self.assertIsInstance(rule.kwargs, module.GroupRuleConfig.Kwargs)
+        self.assertEqual(rule.kwargs.lr, 0.2)
+        self.assertIs(rule.replace(weight_decay=0.1).kwargs, rule.kwargs)
+        self.assertIs(rule.replace(kwargs=obj.rules[0].kwargs).kwargs, obj.rules[0].kwargs)
+        changed = obj.replace(rules=[{'prefix_list': ['b', 'c'], 'kwargs': {'lr': 0.2}}])
+        self.assertIsInstance(changed.rules, module.OptimizerWrapperConfig.Rules)
+        self.assertEqual(changed.rules[0], rule)
+        self.assertIs(obj.replace(rules=changed.rules).rules, changed.rules)
+        self.assertEqual(hash(changed), hash(obj.replace(rules=changed.rules)))
+        with self.assertRaises(AttributeError):
+            obj.rules.extra = 1
+
+        schema = {
+            'title': 'job',
+            'type': 'object',
+            'properties': {
+                'meta': {'type': 'object', 'default': {'tags': ['a']}},
+                'hooks': {'type': 'array', 'items': {'type': 'object'}},
+                'sizes': {'type': 'array', 'items': {'type': 'integer'}, 'default': [1]}
+            }
+        }
+        options = json_schema_to_class.Options(generate_frozen_classes=True, generate_to_dict_method=True)
+        module = types.ModuleType('frozen_values')
+        exec(json_schema_to_class.generate_schema_code(schema, options), module.__dict__)
+        sys.modules[module.__name__] = module
+        try:
+            values = {'meta': {'tags': ['b'], 'owner': {'id': 1}}, 'hooks': [{'name': 'x'}]}
+            job = module.Job(values)
+            self.assertEqual({job: 1}[module.Job(values)], 1)
+            self.assertEqual(hash(module.Job()), hash(module.Job()))
+            self.assertEqual(job.meta['tags'], ('b',))
+            self.assertIsInstance(job.meta, dict)
+            self.assertRaises(TypeError, job.meta.update, owner=None)
+            self.assertRaises(TypeError, job.hooks[0].__setitem__, 'name', 'y')
+            self.assertEqual(hash(job.replace(meta={'tags': ['b'], 'owner': {'id': 1}})), hash(job))
+            self.assertEqual(job.to_dict(), {**values, 'sizes': [1]})
+            self.assertEqual(type(job.to_dict()['meta']['tags']), list)
+            self.assertEqual(pickle.loads(pickle.dumps(job)), job)
+        finally:
+            del sys.modules[module.__name__]
+
+    def test_generate_pickle(self):
+        values = {'momentum': 0.9, 'rules': [{'prefix_list': ['a'], 'kwargs': {'lr': 0.1}}]}
+        for name, options in (
+            ('pickle', {'generate_pickle_methods': True, 'generate_slots': True}),
+            ('pickle_lazy', {'generate_pickle_methods': True, 'generate_lazy_properties': True}),
+            ('frozen', {'generate_frozen_classes': True}),
+        ):
+            code = json_schema_to_class.generate_code(self.schema_path_2, json_schema_to_class.Options(**options))
+            module = types.ModuleType(f'test_pickle_{name}')
+            exec(code, module.__dict__)
+            sys.modules[module.__name__] = module
+            try:
+                obj = module.OptimizerWrapperConfig(values)
+                if name != 'frozen':
+                    self.assertEqual(obj.__getstate__(), ('SGD', 0.9, None, 0.0001, obj.rules))
+                copied = pickle.loads(pickle.dumps(obj))
+                self.assertIs(type(copied.rules[0].kwargs), module.GroupRuleConfig.Kwargs)
+                self.assertEqual(copied.rules[0].kwargs.lr, 0.1)
+                self.assertEqual(copied.rules[0].prefix_list, obj.rules[0].prefix_list)
+                self.assertEqual((copied.momentum, copied.weight_decay), (0.9, 0.0001))
+            finally:
+                del sys.modules[module.__name__]
+        self.assertEqual(copied, obj)
+        self.assertEqual(hash(copied), hash(obj))
+
+    def test_generate_instrumentation(self):
+        self.assertNotIn('_STATS', json_schema_to_class.generate_code(self.schema_path_2))
+        options = json_schema_to_class.Options(generate_instrumentation=True)
+        parser = json_schema_to_class.Parser(options=options, schema_path=self.schema_path_2)
+        schema = parser.store.load(self.schema_path_2)
+        parser.parse(schema)
+        module = types.ModuleType('instrumented')
+        exec(parser.generate(schema), module.__dict__)
+        self.assertEqual(sorted(parser.timings), ['generate', 'parse'])
+
+        stats = json_schema_to_class.construction_stats
+        sunk = []
+        stats.reset()
+        stats.sink = lambda cls, seconds: sunk.append(cls)
+        try:
+            module.OptimizerWrapperConfig({'rules': [{}, {}]})
+            snapshot = stats.snapshot()
+            self.assertEqual(snapshot['instrumented.GroupRuleConfig.Kwargs']['count'], 2)
+            self.assertEqual(snapshot['instrumented.OptimizerWrapperConfig.Rules']['samples'], 1)
+            self.assertGreater(snapshot['instrumented.OptimizerWrapperConfig']['seconds'], 0)
+            self.assertEqual(sunk.count(module.GroupRuleConfig), 2)
+
+            stats.reset()
+            stats.sample_rate = 0.0
+            module.GroupRuleConfig()
+            self.assertEqual(stats.snapshot(), {'instrumented.GroupRuleConfig.Kwargs': {
+                'count': 1, 'samples': 0, 'seconds': 0.0
+            }, 'instrumented.GroupRuleConfig': {'count': 1, 'samples': 0, 'seconds': 0.0}})
+            self.assertEqual(stats.snapshot()['instrumented.GroupRuleConfig']['count'], 1)
+
+            stats.reset()
+            self.assertRaises(TypeError, module.OptimizerWrapperConfig, {'rules': 5})
+            snapshot = stats.snapshot()
+            self.assertEqual(snapshot['instrumented.OptimizerWrapperConfig.Rules']['count'], 1)
+            self.assertEqual(snapshot['instrumented.OptimizerWrapperConfig']['count'], 1)
+
+            sunk.clear()
+            reference = weakref.ref(module.OptimizerWrapperConfig)
+            del module
+            gc.collect()
+            self.assertIsNone(reference())
+            self.assertIn('instrumented.OptimizerWrapperConfig', stats.snapshot())
+        finally:
+            stats.sink, stats.sample_rate = None, 1.0
+            stats.reset()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report = json_schema_to_class.generate_dir(self.schema_path.parent, Path(temp_dir))
+            self.assertEqual(sorted(report.timings), sorted(report.generated))
+            self.assertEqual(sorted(report.timings['test_schema.json']), ['generate', 'parse'])
+
+    def test_generate_enum(self):
+        schema = {
+            'title': 'job',
+            'type': 'object',
+            'properties': {
+                'state': {'enum': ['queued', 'running', 'done'], 'default': 'queued'},
+                'last_state': {'type': 'string', 'enum': ['done', 'queued', 'running']},
+                'priority': {'type': 'integer', 'enum': [1, 2, 3], 'default': 2},
+                'flags': {'type': 'array', 'items': {'enum': ['fast', 'low-cost', '2x']}, 'default': ['fast']},
+                'ready': {'type': 'boolean', 'enum': [True]},
+                'tasks': {'type': 'array', 'items': {
+                    'type': 'object', 'properties': {'state': {'enum': ['queued', 'running', 'done']}}
+                }},
+            }
+        }
+        parser = json_schema_to_class.Parser(options=json_schema_to_class.Options(generate_enum_classes=True))
+        parser.parse(schema)
+        self.assertEqual(len(parser.enums), 3)
+        self.assertNotIn('import enum', json_schema_to_class.generate_schema_code(schema))
+
+        for options in ({}, {'generate_frozen_classes': True}, {'generate_columnar_arrays': True}):
+            module = json_schema_to_class.compile_schema(
+                schema, json_schema_to_class.Options(generate_enum_classes=True, **options)
+            )
+            self.assertEqual([member.name for member in module.Flags], ['FAST', 'LOW_COST', 'VALUE_2X'])
+            self.assertTrue(issubclass(module.Priority, enum.IntEnum))
+            obj = module.Job({'last_state': 'done', 'flags': ['2x'], 'tasks': [{'state': 'running'}]})
+            self.assertIs(obj.state, module.State.QUEUED)
+            self.assertIs(obj.last_state, module.State.DONE)
+            self.assertIs(obj.priority, module.Priority.VALUE_2)
+            self.assertEqual(list(obj.flags), [module.Flags.VALUE_2X])
+            self.assertEqual(list(module.Job().flags), [module.Flags.FAST])
+            self.assertIs(obj.ready, None)
+            self.assertIs(obj.tasks[0].state, module.State.RUNNING)
+            self.assertEqual(obj.state, 'queued')
+            self.assertIs(module.Job({'state': module.State.DONE}).state, module.State.DONE)
+            self.assertRaises(ValueError, module.Job, {'state': 'paused'})
+
+        options = json_schema_to_class.Options(generate_enum_classes=True)
+        for name, definition in (('state', {'enum': ['queued'], 'default': 'paused'}),
+                                 ('flags', {'type': 'array', 'items': {'enum': ['x']}, 'default': ['x', 'z']})):
+            parser = json_schema_to_class.Parser(options=options)
+            with self.assertRaisesRegex(ValueError, f"Default '(paused|z)' of \"{name}\" is not one of"):
+                parser.parse({'title': 'job', 'type': 'object', 'properties': {name: definition}})
+
+    def test_generate_lazy(self):
+        json_schema_to_class.Config.generate_lazy_properties = True
+        json_schema_to_class.Config.generate_slots = True
+        json_schema_to_class.Config.generate_to_dict_method = True
+        output_path = self.temp_path / 'test_lazy.py'
+        json_schema_to_class.generate_file(self.schema_path_2, output_path)
+        module = absolute_import(name='lazy', module_path=output_path)
+
+        obj = module.OptimizerWrapperConfig({'momentum': 0.9, 'rules': [{'kwargs': {'lr': 1}}, {}]})
+        self.assertEqual(obj.momentum, 0.9)
+        self.assertIsNone(obj._rules)
+        self.assertIsNone(obj.rules[1]._kwargs)
+        self.assertEqual(obj.rules[0].kwargs.lr, 1)
+        self.assertIs(obj.rules, obj.rules)
+        self.assertEqual(obj.to_dict()['rules'][1]['kwargs'], {'lr': None})
+
+        obj.rules = []
+        self.assertEqual(obj.rules, [])
+
+    def test_compile_schema(self):
+        json_schema_to_class.module_cache.clear()
+        cls = json_schema_to_class.compile_class(self.test_schema)
+        self.assertEqual(cls.__name__, 'LrSchedulerConfigs')
+        self.assertEqual(cls([{'warm_up': {'steps': 2}}])[0].warm_up.steps, 2)
+
+        schema = json.loads(json.dumps(self.test_schema, sort_keys=True))
+        self.assertIs(json_schema_to_class.compile_class(schema), cls)
+
+        json_schema_to_class.Config.generate_repr_method = True
+        self.assertIsNot(json_schema_to_class.compile_class(schema), cls)
+        self.assertEqual(len(json_schema_to_class.module_cache.modules), 2)
+
+        json_schema_to_class.module_cache.max_size = 1
+        try:
+            json_schema_to_class.compile_schema(schema)
+            json_schema_to_class.compile_schema(dict(schema, title='other'))
+            self.assertEqual(len(json_schema_to_class.module_cache.modules), 1)
+        finally:
+            json_schema_to_class.module_cache.max_size = 128
+
+    def test_import_hook(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            package_dir = Path(temp_dir) / 'hooked_configs'
+            package_dir.mkdir()
+            (package_dir / '__init__.py').write_text('')
+            schema_path = package_dir / 'lr_scheduler.json'
+            shutil.copy(str(self.schema_path), str(schema_path))
+
+            other_dir = Path(temp_dir) / 'hooked_data'
+            other_dir.mkdir()
+            (other_dir / '__init__.py').write_text('')
+            (other_dir / 'fixtures.json').write_text('[1, 2]')
+
+            sys.path.insert(0, temp_dir)
+            json_schema_to_class.install_import_hook(packages=['hooked_configs'])
+            try:
+                self.assertRaises(ModuleNotFoundError, importlib.import_module, 'hooked_data.fixtures')
+                module = importlib.import_module('hooked_configs.lr_scheduler')
+                self.assertEqual(module.__file__, str(schema_path))
+                self.assertEqual(module.LrSchedulerConfigs([{}])[0].warm_up.steps, 0)
+                self.assertEqual(len(list((package_dir / '__pycache__').glob('lr_scheduler.*.jsc'))), 1)
+
+                with mock.patch.object(json_schema_to_class.Parser, 'generate', side_effect=AssertionError):
+                    del sys.modules['hooked_configs.lr_scheduler']
+                    importlib.import_module('hooked_configs.lr_scheduler')
+
+                    os.utime(str(schema_path), ns=(0, 0))
+                    del sys.modules['hooked_configs.lr_scheduler']
+                    importlib.import_module('hooked_configs.lr_scheduler')
+
+                with mock.patch.object(json_schema_to_class, 'generator_digest', return_value='upgraded'), \
+                        mock.patch.object(json_schema_to_class.Parser, 'generate', side_effect=RuntimeError):
+                    del sys.modules['hooked_configs.lr_scheduler']
+                    self.assertRaises(RuntimeError, importlib.import_module, 'hooked_configs.lr_scheduler')
+                importlib.import_module('hooked_configs.lr_scheduler')
+
+                schema = dict(self.test_schema, title='renamed_configs')
+                schema_path.write_text(json.dumps(schema))
+                del sys.modules['hooked_configs.lr_scheduler']
+                module = importlib.import_module('hooked_configs.lr_scheduler')
+                self.assertTrue(hasattr(module, 'RenamedConfigs'))
+
+                address = {'type': 'object', 'properties': {'city': {'type': 'string', 'default': 'Paris'}}}
+                person = {'title': 'person', 'type': 'object', 'properties': {
+                    'home': {'$ref': 'common.json#/definitions/address'}
+                }}
+                (package_dir / 'common.json').write_text(json.dumps({'definitions': {'address': address}}))
+                (package_dir / 'person.json').write_text(json.dumps(person))
+                module = importlib.import_module('hooked_configs.person')
+                self.assertEqual(module.Person().home.city, 'Paris')
+                cls = json_schema_to_class.compile_class(person, schema_path=package_dir / 'person.json')
+                self.assertEqual(cls().home.city, 'Paris')
+
+                address['properties']['city']['default'] = 'Rome'
+                (package_dir / 'common.json').write_text(json.dumps({'definitions': {'address': address}}))
+                os.utime(str(package_dir / 'common.json'), ns=(0, 0))
+                del sys.modules['hooked_configs.person']
+                module = importlib.import_module('hooked_configs.person')
+                self.assertEqual(module.Person().home.city, 'Rome')
+            finally:
+                json_schema_to_class.uninstall_import_hook()
+                sys.path.remove(temp_dir)
+                for name in [name for name in sys.modules if name.startswith(('hooked_configs', 'hooked_data'))]:
+                    del sys.modules[name]
+
+    def test_concurrent_generate(self):
+        schemas = []
+        for schema_path in sorted(self.schema_path.parent.glob('*.json')):
+            with open(str(schema_path)) as f:
+                schemas.append(json.load(f))
+        option_list = [
+            json_schema_to_class.Options(),
+            json_schema_to_class.Options(indent=2, generate_repr_method=True),
+            json_schema_to_class.Options(generate_validate_code=True, generated_warning=False),
+            json_schema_to_class.Options(generate_lazy_properties=True, generate_slots=True),
+            json_schema_to_class.Options(indent=3, generate_inline_validate_code=True, generate_to_dict_method=True),
+        ]
+        tasks = [(schema, options) for schema in schemas for options in option_list] * 20
+        expected = [json_schema_to_class.generate_schema_code(schema, options) for schema, options in tasks]
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda task: json_schema_to_class.generate_schema_code(*task), tasks))
+        self.assertEqual(results, expected)
+        self.assertEqual(len(set(results)), len(schemas) * len(option_list))
+        self.assertRaises(TypeError, json_schema_to_class.Options, unknown=True)
+
+    def test_deep_nesting(self):
+        schema = {'type': 'object', 'properties': {'value': {'type': 'integer', 'default': 7}}}
+        for depth in range(12):
+            schema = {'type': 'object', 'properties': {f'level_{depth}': schema}}
+        schema['title'] = 'deep'
+
+        options = json_schema_to_class.Options(indent=2, generate_repr_method=True)
+        code = json_schema_to_class.generate_schema_code(schema, options)
+        self.assertIn(' ' * 2 * 12 + 'class Level0:', code)
+        namespace = {}
+        exec(code, namespace)
+        obj = namespace['Deep']()
+        for depth in reversed(range(12)):
+            obj = getattr(obj, f'level_{depth}')
+        self.assertEqual(obj.value, 7)
+
+    def test_nesting_beyond_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 2
+        schema = {'type': 'object', 'properties': {'value': {'type': 'integer', 'default': 7}}}
+        for level in range(depth):
+            if level % 2:
+                schema = {'type': 'array', 'items': schema, 'default': [{}]}
+            schema = {'type': 'object', 'properties': {f'level_{level}': schema}}
+        schema['title'] = 'deep'
+
+        options = json_schema_to_class.Options(
+            deduplicate_models=True, generate_to_dict_method=True, generate_lazy_properties=True
+        )
+        code = json_schema_to_class.generate_schema_code(schema, options)
+        self.assertEqual(code.count('class '), depth + depth // 2 + 1)
+        self.assertNotIn(' ' * 4 * json_schema_to_class.Parser.MAX_CLASS_DEPTH + 'class ', code)
+        compile(code, 'deep', 'exec')
+
+        module = json_schema_to_class.compile_schema(schema, options)
+        obj = module.Deep()
+        for level in reversed(range(depth)):
+            obj = getattr(obj, f'level_{level}')
+            if level % 2:
+                obj = obj[0]
+        self.assertEqual(obj.value, 7)
+
+    def test_deduplicate_models(self):
+        point = {'type': 'object', 'properties': {'x': {'type': 'number'}, 'y': {'type': 'number'}}}
+        pair = {'type': 'object', 'properties': {'low': {**point, 'description': 'low'}, 'high': point}}
+        schema = {
+            'title': 'shape',
+            'type': 'object',
+            'definitions': {'coord': point},
+            'properties': {
+                'start': point,
+                'other': {'$ref': '#/definitions/coord'},
+                'box': pair,
+                'range': pair,
+                'path': {'type': 'array', 'items': {'type': 'object', 'properties': {'x': {'type': 'string'}}}}
+            }
+        }
+        parser = json_schema_to_class.Parser(json_schema_to_class.Options(deduplicate_models=True))
+        parser.parse(schema)
+        code = parser.generate(schema)
+        self.assertEqual(parser.deduplicated, 6)
+        self.assertEqual(code.count('class Coord:'), 1)
+        self.assertEqual(code.count('class Box:'), 1)
+        self.assertNotIn('class Range:', code)
+        self.assertIn('class Items:', code)
+
+        namespace = {}
+        exec(code, namespace)
+        shape = namespace['Shape']({'start': {'x': 1}, 'range': {'high': {'y': 2}}})
+        self.assertIs(type(shape.start), namespace['Coord'])
+        self.assertIs(type(shape.range), namespace['Box'])
+        self.assertIs(type(shape.range.low), namespace['Coord'])
+        self.assertEqual(shape.range.high.y, 2)
+
+        schema_dir = self.temp_path / 'schemas'
+        schema_dir.mkdir()
+        (schema_dir / 'shape.json').write_text(json.dumps(schema))
+        options = json_schema_to_class.Options(deduplicate_models=True)
+        report = json_schema_to_class.generate_dir(schema_dir, self.temp_path / 'build', options=options)
+        self.assertEqual(report.deduplicated, {'shape.json': 6})
+        self.assertIn('deduplicated: 6', repr(report))
+        report = json_schema_to_class.generate_batch([(schema_dir / 'shape.json', self.temp_path / 'shape.py')])
+        self.assertEqual(report.deduplicated, {})
+        self.assertNotIn('deduplicated', repr(report))
+
+        result = subprocess.run(
+            [sys.executable, json_schema_to_class.__file__, str(schema_dir / 'shape.json'), '--dedupe'],
+            check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        self.assertEqual(result.stdout.decode().count('class Coord:'), 1)
+        self.assertEqual(result.stderr.decode().strip(), 'deduplicated: 6')
+
 
 if __name__ == '__main__':
     unittest.main()